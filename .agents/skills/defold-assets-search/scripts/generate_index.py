@@ -1,26 +1,126 @@
-"""Download Defold Asset Store JSON and generate a compact TSV index.
+"""Download Defold Asset Store JSON and generate a compact TSV index and a search database.
 
 Usage:
-    python .agents/skills/defold-assets-search/scripts/generate_index.py
+    python .agents/skills/defold-assets-search/scripts/generate_index.py [--source URL_OR_PATH]
 
 Output:
     .agents/skills/defold-assets-search/assets/dependencies_index.tsv
+    .agents/skills/defold-assets-search/assets/dependencies_index.sqlite (FTS5, used by search.py)
+    .agents/skills/defold-assets-search/assets/dependencies_delta.json (changes since the previous run)
+
+The previous TSV is diffed by `id`: files are rewritten (atomically) only when
+something changed, and the search database is updated in place.
 """
 
+import argparse
 import json
 import os
+import sys
+import time
 import urllib.request
 
+# search.py is in the same directory; adjust sys.path so it's importable
+# regardless of the current working directory.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from search import COLUMNS, DB_FILE, build_search_db, update_search_db
+
 SOURCE_URL = "https://insality.github.io/asset-store/dependencies_store.json"
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_DIR = os.path.join(SCRIPT_DIR, os.pardir, "assets")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "dependencies_index.tsv")
+DELTA_FILE = os.path.join(OUTPUT_DIR, "dependencies_delta.json")
+
+# Tabs and every character str.splitlines() breaks on, mapped to a space so
+# each entry stays on one TSV row
+_FIELD_BREAKS = str.maketrans({c: " " for c in "\t\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"})
+
+
+def load_source(source: str):
+    """Load the store JSON from a URL or a local file path."""
+    print(f"Downloading {source} ...")
+    if os.path.isfile(source):
+        with open(source, encoding="utf-8") as f:
+            return json.load(f)
+    with urllib.request.urlopen(source) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def read_previous_index(path: str) -> dict[str, dict]:
+    """Read an existing TSV index into {id: row}; empty if missing or malformed."""
+    if not os.path.isfile(path):
+        return {}
+    # Rows end in "\n" only; newline="" keeps a stray "\r" from splitting a row
+    with open(path, encoding="utf-8", newline="") as f:
+        lines = f.read().split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    if not lines or lines[0].split("\t") != COLUMNS:
+        return {}
+    previous: dict[str, dict] = {}
+    for line in lines[1:]:
+        values = line.split("\t")
+        if len(values) == len(COLUMNS):
+            previous[values[0]] = dict(zip(COLUMNS, values))
+    return previous
+
+
+def diff_index(previous: dict[str, dict], rows: list[dict]) -> dict:
+    """Compare two indexes by id.
+
+    Returns a delta dict: added / removed / updated id lists, `stars` as
+    {id: [old, new]} and `new_versions` as {id: [old_zip, new_zip]}.
+    """
+    current = {row["id"]: row for row in rows}
+    delta: dict = {
+        "added": [i for i in current if i not in previous],
+        "removed": [i for i in previous if i not in current],
+        "updated": [],
+        "stars": {},
+        "new_versions": {},
+    }
+    for entry_id, row in current.items():
+        old = previous.get(entry_id)
+        if old is None or old == row:
+            continue
+        delta["updated"].append(entry_id)
+        if old["stars"] != row["stars"]:
+            delta["stars"][entry_id] = [int(old["stars"] or 0), int(row["stars"] or 0)]
+        if old["latest_zip"] != row["latest_zip"]:
+            delta["new_versions"][entry_id] = [old["latest_zip"], row["latest_zip"]]
+    return delta
+
+
+def write_atomic(path: str, text: str) -> None:
+    """Write text to path via a temporary file and os.replace()."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def print_delta(delta: dict, titles: dict[str, str]) -> None:
+    """Print a compact, human-readable summary of an index delta."""
+    print(
+        f"Changes: {len(delta['added'])} new, {len(delta['removed'])} removed, {len(delta['updated'])} updated, "
+        f"{len(delta['stars'])} star change(s), {len(delta['new_versions'])} new release(s)."
+    )
+    for entry_id in delta["added"]:
+        print(f"  new: {entry_id} ({titles.get(entry_id, '')})")
+    for entry_id in delta["removed"]:
+        print(f"  removed: {entry_id}")
+    for entry_id, (old_zip, new_zip) in delta["new_versions"].items():
+        print(f"  release: {entry_id} {old_zip or '-'} -> {new_zip or '-'}")
+    for entry_id, (old_stars, new_stars) in delta["stars"].items():
+        print(f"  stars: {entry_id} {old_stars} -> {new_stars}")
 
 
 def main() -> None:
-    print(f"Downloading {SOURCE_URL} ...")
-    with urllib.request.urlopen(SOURCE_URL) as resp:
-        raw = json.loads(resp.read().decode("utf-8"))
+    parser = argparse.ArgumentParser(description="Generate the Defold Asset Store index.")
+    parser.add_argument("--source", default=SOURCE_URL,
+                        help="Store JSON URL or local file (default: the public asset store)")
+    args = parser.parse_args()
+
+    raw = load_source(args.source)
 
     # The JSON has an "items" key containing the list
     data: list[dict] = raw.get("items", raw) if isinstance(raw, dict) else raw
@@ -33,8 +133,9 @@ def main() -> None:
     # Sort by stars descending (None → 0)
     entries.sort(key=lambda e: e.get("stars") or 0, reverse=True)
 
-    header = "id\ttitle\tauthor\tdescription\ttags\tstars\tapi\texample_code\tmanifest_url\tlatest_zip"
+    header = "\t".join(COLUMNS)
     lines: list[str] = [header]
+    rows: list[dict] = []
 
     for e in entries:
         latest_zip = ""
@@ -43,9 +144,9 @@ def main() -> None:
             latest_zip = content[-1]
 
         tags_str = ", ".join(e.get("tags") or [])
-        desc = (e.get("description") or "").replace("\t", " ").replace("\n", " ")
+        desc = e.get("description") or ""
 
-        line = "\t".join([
+        values = [
             e.get("id") or "",
             e.get("title") or "",
             e.get("author") or "",
@@ -56,13 +157,44 @@ def main() -> None:
             e.get("example_code") or "",
             e.get("manifest_url") or "",
             latest_zip,
-        ])
-        lines.append(line)
-
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines) + "\n")
-
-    print(f"Generated {OUTPUT_FILE} with {len(entries)} entries.")
+        ]
+        values = [v.translate(_FIELD_BREAKS) for v in values]
+        lines.append("\t".join(values))
+        rows.append(dict(zip(COLUMNS, values)))
+
+    previous = read_previous_index(OUTPUT_FILE)
+    delta = diff_index(previous, rows)
+    changed = any(delta[k] for k in ("added", "removed", "updated"))
+
+    if not previous:
+        # First run (or unreadable old index): list every entry as new, without details
+        print(f"No previous index, all {len(rows)} entries are new.")
+    elif changed:
+        print_delta(delta, {row["id"]: row["title"] for row in rows})
+    else:
+        print("No changes since the previous index.")
+
+    if changed or not os.path.isfile(OUTPUT_FILE):
+        write_atomic(OUTPUT_FILE, "\n".join(lines) + "\n")
+        print(f"Generated {OUTPUT_FILE} with {len(entries)} entries.")
+    else:
+        # Keep the content, but refresh the mtime so the 24-hour freshness check passes
+        os.utime(OUTPUT_FILE)
+        print(f"Kept {OUTPUT_FILE} ({len(entries)} entries).")
+
+    delta["generated_at"] = int(time.time())
+    write_atomic(DELTA_FILE, json.dumps(delta, ensure_ascii=False, indent=2) + "\n")
+
+    if previous and os.path.isfile(DB_FILE):
+        changed_ids = set(delta["added"]) | set(delta["updated"])
+        if changed_ids or delta["removed"]:
+            reindexed = update_search_db(
+                [row for row in rows if row["id"] in changed_ids], delta["removed"], DB_FILE
+            )
+            print(f"Updated {DB_FILE}: {reindexed} re-indexed, {len(delta['removed'])} removed.")
+    else:
+        indexed = build_search_db(rows, DB_FILE)
+        print(f"Generated {DB_FILE} with {indexed} searchable entries.")
 
 
 if __name__ == "__main__":
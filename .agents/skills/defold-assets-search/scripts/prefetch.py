@@ -0,0 +1,236 @@
+"""Prefetch README, API and manifest pages of the top search candidates into a local cache.
+
+Usage:
+    python .agents/skills/defold-assets-search/scripts/prefetch.py <query> [--top N] [--workers N] [--offline] [--format tsv|json]
+
+Input:
+    .agents/skills/defold-assets-search/assets/dependencies_index.sqlite (see generate_index.py)
+
+Output:
+    .agents/skills/defold-assets-search/assets/cache/<sha1 of url>.body  — page content
+    .agents/skills/defold-assets-search/assets/cache/<sha1 of url>.json  — url, ETag, Last-Modified
+
+For every candidate the `example_code`, `api` and `manifest_url` pages are
+downloaded in parallel.  Cached pages are revalidated with If-None-Match /
+If-Modified-Since, served as-is when the network is unavailable, and never
+touched with --offline.  Version lists are extracted from the manifests.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# search.py is in the same directory; adjust sys.path so it's importable
+# regardless of the current working directory.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from search import DB_FILE, OUTPUT_DIR, search
+
+CACHE_DIR = os.path.normpath(os.path.join(OUTPUT_DIR, "cache"))
+URL_FIELDS = ["example_code", "api", "manifest_url"]
+USER_AGENT = "defold-assets-prefetch-py"
+
+# Version from dependency zip URLs such as .../archive/refs/tags/v1.2.zip,
+# .../archive/1.2.zip or .../releases/download/1.2/lib.zip
+_VERSION_PATTERNS = [
+    re.compile(r"/archive/(?:refs/tags/)?([^/]+?)\.zip$"),
+    re.compile(r"/releases/download/([^/]+)/[^/]+$"),
+    re.compile(r"/tags/([^/]+?)\.zip$"),
+]
+
+
+def cache_paths(url: str, cache_dir: str = CACHE_DIR) -> tuple[str, str]:
+    """Return (body_path, meta_path) for a cached URL."""
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, key + ".body"), os.path.join(cache_dir, key + ".json")
+
+
+def _read_meta(meta_path: str) -> dict:
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Unique per writer: concurrent prefetch runs share the cache directory
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def fetch_cached(url: str, *, offline: bool = False, cache_dir: str = CACHE_DIR,
+                 timeout: float = 30.0) -> dict:
+    """Fetch a URL through the cache and return a result dict.
+
+    Result keys: url, path (cached body or ""), status ("fetched", "not-modified",
+    "cached", "missing" or "error") and error (message, if any).
+    """
+    body_path, meta_path = cache_paths(url, cache_dir)
+    meta = _read_meta(meta_path)
+    have_cache = bool(meta) and os.path.isfile(body_path)
+    result = {"url": url, "path": body_path if have_cache else "", "status": "cached", "error": ""}
+
+    if offline:
+        if not have_cache:
+            result["status"] = "missing"
+        return result
+
+    headers = {"User-Agent": USER_AGENT}
+    if have_cache:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read()
+            new_meta = {
+                "url": url,
+                "etag": response.headers.get("ETag") or "",
+                "last_modified": response.headers.get("Last-Modified") or "",
+                "fetched_at": int(time.time()),
+            }
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_atomic(body_path, data)
+        _write_atomic(meta_path, json.dumps(new_meta).encode("utf-8"))
+        result.update(path=body_path, status="fetched")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and have_cache:
+            meta["fetched_at"] = int(time.time())
+            _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+            result["status"] = "not-modified"
+        else:
+            result.update(status="cached" if have_cache else "error", error=f"HTTP {e.code}")
+    except (urllib.error.URLError, OSError) as e:
+        # Network problems: fall back to the cached copy when there is one
+        result.update(status="cached" if have_cache else "error", error=str(e))
+
+    return result
+
+
+def extract_versions(manifest_text: str) -> list[str]:
+    """Extract the version list (oldest first) from an asset store manifest."""
+    try:
+        manifest = json.loads(manifest_text)
+    except ValueError:
+        return []
+
+    urls: list[str] = []
+    if isinstance(manifest, dict):
+        content = manifest.get("content") or manifest.get("versions") or []
+    else:
+        content = manifest
+    for item in content:
+        if isinstance(item, str):
+            urls.append(item)
+        elif isinstance(item, dict):
+            if item.get("version"):
+                urls.append(str(item["version"]))
+                continue
+            urls.append(item.get("url") or item.get("zip") or "")
+
+    versions: list[str] = []
+    for url in urls:
+        version = url
+        for pattern in _VERSION_PATTERNS:
+            match = pattern.search(url)
+            if match:
+                version = match.group(1)
+                break
+        if version and version not in versions:
+            versions.append(version)
+    return versions
+
+
+def prefetch(candidates: list[dict], *, workers: int = 8, offline: bool = False,
+             cache_dir: str = CACHE_DIR) -> list[dict]:
+    """Fetch all candidate URLs in one parallel batch.
+
+    Returns one dict per candidate with id, title, stars, a `pages` mapping
+    (field → fetch result) and the `versions` parsed from the manifest.
+    """
+    urls = list(dict.fromkeys(c[f] for c in candidates for f in URL_FIELDS if c.get(f)))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        fetched = dict(zip(urls, pool.map(
+            lambda u: fetch_cached(u, offline=offline, cache_dir=cache_dir), urls
+        )))
+
+    out: list[dict] = []
+    for c in candidates:
+        pages = {f: fetched[c[f]] for f in URL_FIELDS if c.get(f)}
+        versions: list[str] = []
+        manifest = pages.get("manifest_url")
+        if manifest and manifest["path"]:
+            with open(manifest["path"], encoding="utf-8", errors="replace") as f:
+                versions = extract_versions(f.read())
+        out.append({
+            "id": c["id"],
+            "title": c["title"],
+            "stars": c["stars"],
+            "latest_zip": c.get("latest_zip", ""),
+            "pages": pages,
+            "versions": versions,
+        })
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Prefetch README/API/manifest pages of the top asset store candidates."
+    )
+    parser.add_argument("query", nargs="+", help="Search words (same as search.py)")
+    parser.add_argument("--top", "-n", type=int, default=5, help="Number of candidates (default: 5)")
+    parser.add_argument("--workers", "-w", type=int, default=8,
+                        help="Parallel downloads (default: 8)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Do not touch the network, report cached pages only")
+    parser.add_argument("--format", "-f", choices=["tsv", "json"], default="tsv",
+                        help="Output format (default: tsv)")
+    args = parser.parse_args()
+
+    if not os.path.isfile(DB_FILE):
+        print(f"ERROR: {DB_FILE} not found. Run generate_index.py first.", file=sys.stderr)
+        return 1
+
+    candidates = search(" ".join(args.query), args.top)
+    start = time.perf_counter()
+    results = prefetch(candidates, workers=args.workers, offline=args.offline)
+    elapsed = time.perf_counter() - start
+
+    if args.format == "json":
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print("id\tfield\tstatus\tpath\turl")
+        for r in results:
+            for field, page in r["pages"].items():
+                print(f"{r['id']}\t{field}\t{page['status']}\t{page['path']}\t{page['url']}")
+            if r["versions"]:
+                print(f"{r['id']}\tversions\t{len(r['versions'])}\t\t{', '.join(r['versions'])}")
+
+    errors = [p for r in results for p in r["pages"].values() if p["error"]]
+    for page in errors:
+        print(f"WARNING: {page['url']}: {page['error']}", file=sys.stderr)
+    print(f"Prefetched {len(results)} candidate(s) in {elapsed:.2f}s.", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""Search the Defold Asset Store index with SQLite FTS5 (BM25 ranking weighted by stars).
+
+Usage:
+    python .agents/skills/defold-assets-search/scripts/search.py <query> [--limit N] [--format tsv|json]
+
+Input:
+    .agents/skills/defold-assets-search/assets/dependencies_index.sqlite
+    (built by generate_index.py next to dependencies_index.tsv)
+
+Output:
+    Top-k candidates as TSV (same columns as the TSV index plus score) or JSON.
+
+Query words are prefix-matched and expanded with Defold-specific synonyms
+(RNG → random, i18n → localization, tween → easing, ...).  Deprecated
+libraries are filtered out when the database is built.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, os.pardir, "assets")
+DB_FILE = os.path.join(OUTPUT_DIR, "dependencies_index.sqlite")
+
+COLUMNS = [
+    "id", "title", "author", "description", "tags", "stars",
+    "api", "example_code", "manifest_url", "latest_zip",
+]
+
+# Full-text columns and their BM25 weights (title and id matter most).
+FTS_WEIGHTS = {
+    "id": 8.0,
+    "title": 10.0,
+    "author": 2.0,
+    "description": 1.0,
+    "tags": 4.0,
+}
+
+# Libraries that must never be suggested.
+DEPRECATED_IDS = {"scene3d"}
+
+# Groups of interchangeable search terms.  Multi-word entries are matched as phrases.
+SYNONYM_GROUPS = [
+    ["rng", "random", "pcg"],
+    ["i18n", "l10n", "localization", "localisation", "translation", "lang"],
+    ["tween", "tweening", "easing", "ease"],
+    ["pathfinding", "path finding", "astar", "a star", "navigation", "navmesh"],
+    ["gui", "ui", "widget"],
+    ["save", "saver", "storage", "persistence"],
+    ["input", "gesture", "touch"],
+    ["screen", "screens", "scene manager"],
+    ["event", "events", "signal", "broadcast"],
+    ["dialog", "dialogue", "narrative"],
+    ["camera", "cam"],
+    ["sound", "audio", "music"],
+    ["log", "logger", "logging"],
+    ["ads", "advertising", "admob"],
+    ["iap", "purchase", "billing"],
+    ["particle", "particles", "particlefx", "vfx"],
+    ["aabb", "collision", "raycast"],
+    ["shader", "shaders", "material"],
+]
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE entries (
+    id TEXT PRIMARY KEY,
+    title TEXT, author TEXT, description TEXT, tags TEXT, stars INTEGER,
+    api TEXT, example_code TEXT, manifest_url TEXT, latest_zip TEXT,
+    boost REAL
+);
+CREATE VIRTUAL TABLE entries_fts USING fts5(
+    id, title, author, description, tags,
+    prefix='2 3',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TABLE synonyms (term TEXT, synonym TEXT);
+CREATE INDEX synonyms_term ON synonyms (term);
+"""
+
+
+def is_deprecated(row: dict) -> bool:
+    """Return True for libraries that are deprecated and must not be indexed."""
+    return (row.get("id") or "").lower() in DEPRECATED_IDS or \
+        (row.get("title") or "").lower() in DEPRECATED_IDS
+
+
+def star_boost(stars: int) -> float:
+    """Multiplier applied to the (negative) BM25 score — more stars rank higher."""
+    return 1.0 + math.log10(1 + max(stars, 0))
+
+
+def insert_entries(conn: sqlite3.Connection, rows: list[dict]) -> int:
+    """Insert index rows (dicts keyed by COLUMNS) into entries and entries_fts."""
+    count = 0
+    for row in rows:
+        if is_deprecated(row):
+            continue
+        stars = int(row.get("stars") or 0)
+        cur = conn.execute(
+            "INSERT INTO entries (id, title, author, description, tags, stars, "
+            "api, example_code, manifest_url, latest_zip, boost) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [row.get(c) or "" for c in COLUMNS[:5]] + [stars] +
+            [row.get(c) or "" for c in COLUMNS[6:]] + [star_boost(stars)],
+        )
+        conn.execute(
+            "INSERT INTO entries_fts (rowid, id, title, author, description, tags) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [cur.lastrowid] + [row.get(c) or "" for c in FTS_WEIGHTS],
+        )
+        count += 1
+    return count
+
+
+def build_search_db(rows: list[dict], db_path: str = DB_FILE) -> int:
+    """Build the FTS5 search database from index rows, replacing it atomically.
+
+    Returns the number of indexed (non-deprecated) entries.
+    """
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        count = insert_entries(conn, rows)
+        for group in SYNONYM_GROUPS:
+            for term in group:
+                for synonym in group:
+                    if synonym != term:
+                        conn.execute("INSERT INTO synonyms VALUES (?, ?)", (term, synonym))
+        conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('optimize')")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return count
+
+
+def update_search_db(changed: list[dict], removed_ids: list[str], db_path: str = DB_FILE) -> int:
+    """Apply an index delta in place: re-insert `changed` rows and drop `removed_ids`.
+
+    The database must already exist (see build_search_db()).
+    Returns the number of re-indexed entries.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        for entry_id in removed_ids + [row["id"] for row in changed]:
+            for (rowid,) in conn.execute("SELECT rowid FROM entries WHERE id = ?", (entry_id,)).fetchall():
+                conn.execute("DELETE FROM entries_fts WHERE rowid = ?", (rowid,))
+                conn.execute("DELETE FROM entries WHERE rowid = ?", (rowid,))
+        count = insert_entries(conn, changed)
+        conn.commit()
+        return count
+    finally:
+        conn.close()
+
+
+def _fts_term(term: str) -> str:
+    """Quote a term for FTS5: single words are prefix-matched, multi-word terms are phrases."""
+    words = re.findall(r"\w+", term.lower())
+    if not words:
+        return ""
+    phrase = '"' + " ".join(words) + '"'
+    return phrase + "*" if len(words) == 1 else phrase
+
+
+def build_match_query(conn: sqlite3.Connection, query: str) -> str:
+    """Expand query words with synonyms and combine them into an FTS5 MATCH expression."""
+    groups: list[str] = []
+    for word in re.findall(r"\w+", query.lower()):
+        terms = [word] + [
+            s for (s,) in conn.execute("SELECT synonym FROM synonyms WHERE term = ?", (word,))
+        ]
+        alternatives = [t for t in dict.fromkeys(_fts_term(t) for t in terms) if t]
+        if alternatives:
+            groups.append("(" + " OR ".join(alternatives) + ")")
+    return " OR ".join(groups)
+
+
+def search(query: str, limit: int = 10, db_path: str = DB_FILE) -> list[dict]:
+    """Return the top `limit` entries for `query`, best first, each with a `score`."""
+    conn = sqlite3.connect(db_path)
+    try:
+        match = build_match_query(conn, query)
+        if not match:
+            return []
+        weights = ", ".join(str(w) for w in FTS_WEIGHTS.values())
+        sql = (
+            f"SELECT {', '.join('e.' + c for c in COLUMNS)}, "
+            f"bm25(entries_fts, {weights}) * e.boost AS score "
+            "FROM entries_fts JOIN entries e ON e.rowid = entries_fts.rowid "
+            "WHERE entries_fts MATCH ? ORDER BY score LIMIT ?"
+        )
+        results = []
+        for values in conn.execute(sql, (match, limit)):
+            item = dict(zip(COLUMNS, values[:-1]))
+            item["score"] = round(-values[-1], 3)
+            results.append(item)
+        return results
+    finally:
+        conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Search the Defold Asset Store index.")
+    parser.add_argument("query", nargs="+", help="Search words (synonyms and prefixes are matched)")
+    parser.add_argument("--limit", "-k", type=int, default=10, help="Number of results (default: 10)")
+    parser.add_argument("--format", "-f", choices=["tsv", "json"], default="tsv",
+                        help="Output format (default: tsv)")
+    args = parser.parse_args()
+
+    if not os.path.isfile(DB_FILE):
+        print(
+            f"ERROR: {DB_FILE} not found. Run generate_index.py first.",
+            file=sys.stderr,
+        )
+        return 1
+
+    results = search(" ".join(args.query), args.limit)
+
+    if args.format == "json":
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print("\t".join(COLUMNS + ["score"]))
+        for item in results:
+            print("\t".join(str(item[c]) for c in COLUMNS + ["score"]))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+# SPDX-License-Identifier: CC0-1.0
+
+"""Generate a Defold .collisionobject that covers a concave silhouette with a
+few convex TYPE_HULL pieces (approximate convex decomposition).
+
+A single hull from gen_convexshape.py overshoots concave sprites, and the box
+chain from gen_silhouette_chain.py needs one fixture per contour edge.  This
+generator cuts the silhouette polygon at its deepest notches until every
+piece is convex within a tolerance, so solid concave bodies need only a
+handful of Box2D fixtures.
+
+Algorithm:
+    1. Load the image, trace the contour loops and simplify them with
+       Ramer-Douglas-Peucker (same as gen_silhouette_chain.py).
+    2. For every outer loop, measure its concavity: the deepest distance of a
+       polygon vertex below the bridge edge of the convex hull it sits under.
+    3. While a piece is more concave than --concavity, split it with a
+       diagonal from its deepest reflex vertex, preferring diagonals that
+       also resolve the reflex angle (Bayazit-style wedge) and end at
+       another reflex vertex.
+    4. Emit the convex hull of every piece, reduced to --max-points vertices
+       with Visvalingam-Whyatt, as an embedded TYPE_HULL shape.
+
+Holes are filled: pieces are built from outer loops only.
+
+Usage:
+    python gen_convex_decomposition.py <image_path> [options]
+
+Arguments:
+    image_path                Path to a PNG or JPEG image file
+    --output, -o              Output .collisionobject file path (default: stdout)
+    --concavity, -c           Allowed concavity per piece in pixels (default: 4.0)
+    --epsilon, -e             RDP contour simplification tolerance in pixels (default: 1.0)
+    --max-points, -m          Maximum vertices per hull (default: 16, Box2D limit in Defold)
+    --min-area                Drop pieces smaller than this many square pixels (default: 4.0)
+    --alpha-threshold, -a     Alpha threshold for "non-transparent" (0-255, default: 1)
+    --force-png-py            Force using bundled png.py instead of PIL (PNG only)
+    --no-cache                Do not use the decoded alpha cache
+    --scale, --max-dim        Build the mask at reduced resolution (see image_loader)
+    --roi X,Y,W,H             Only use this region of the image
+    --type                    Collision object type: static, dynamic, kinematic (default: static)
+    --mass                    Mass for dynamic objects (default: 1.0 if dynamic, else 0.0)
+    --group, -g               Collision group (default: "default")
+    --mask                    Collision mask group (repeatable, default: "default")
+    --friction                Friction coefficient (default: 0.1)
+    --restitution             Restitution / bounciness (default: 0.5)
+
+Output:
+    Protobuf Text Format .collisionobject with embedded TYPE_HULL shapes,
+    points centred at the image origin (Y up).
+
+Environment:
+    FORCE_PNG_PY=1            Same as --force-png-py
+    DEFOLD_MASK_CACHE=0       Same as --no-cache
+
+Exit code 0 on success, 1 on error.
+"""
+
+import argparse
+import math
+import os
+import sys
+from typing import TextIO
+
+# Sibling modules are in the same directory; adjust sys.path so they're
+# importable regardless of the current working directory.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from gen_convexshape import cross, ensure_ccw, graham_scan
+from gen_silhouette_chain import extract_contours, format_float, simplify_contour
+from image_loader import load_mask, parse_roi, parse_scale
+from simplify import segment_distance, visvalingam_whyatt
+
+Point = tuple[float, float]
+
+OBJECT_TYPES = {
+    "static": "COLLISION_OBJECT_TYPE_STATIC",
+    "dynamic": "COLLISION_OBJECT_TYPE_DYNAMIC",
+    "kinematic": "COLLISION_OBJECT_TYPE_KINEMATIC",
+}
+
+
+# ---------------------------------------------------------------------------
+# Geometry helpers (polygons are counter-clockwise by the shoelace formula)
+# ---------------------------------------------------------------------------
+
+def signed_area(poly: list[Point]) -> float:
+    """Shoelace area; positive for counter-clockwise polygons."""
+    n = len(poly)
+    return sum(
+        poly[i][0] * poly[(i + 1) % n][1] - poly[(i + 1) % n][0] * poly[i][1] for i in range(n)
+    ) / 2.0
+
+
+def _on_segment(p: Point, a: Point, b: Point) -> bool:
+    """True if collinear point P lies within the bounding box of A-B."""
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def _segments_touch(p1: Point, p2: Point, q1: Point, q2: Point) -> bool:
+    """True if segments P1-P2 and Q1-Q2 intersect or touch."""
+    d1 = cross(q1, q2, p1)
+    d2 = cross(q1, q2, p2)
+    d3 = cross(p1, p2, q1)
+    d4 = cross(p1, p2, q2)
+    if ((d1 > 0 > d2) or (d1 < 0 < d2)) and ((d3 > 0 > d4) or (d3 < 0 < d4)):
+        return True
+    return (
+        (d1 == 0 and _on_segment(p1, q1, q2)) or (d2 == 0 and _on_segment(p2, q1, q2))
+        or (d3 == 0 and _on_segment(q1, p1, p2)) or (d4 == 0 and _on_segment(q2, p1, p2))
+    )
+
+
+def _is_reflex(poly: list[Point], i: int) -> bool:
+    n = len(poly)
+    return cross(poly[i - 1], poly[i], poly[(i + 1) % n]) < 0
+
+
+def _is_diagonal(poly: list[Point], i: int, j: int) -> bool:
+    """True if segment i-j runs inside the polygon without touching other edges."""
+    n = len(poly)
+    a, b = poly[i], poly[j]
+    if a == b:
+        return False
+    # Locally inside at i: the direction i→j must lie in the interior angle
+    prev_pt, next_pt = poly[i - 1], poly[(i + 1) % n]
+    if _is_reflex(poly, i):
+        if cross(a, prev_pt, b) > 0 and cross(a, b, next_pt) > 0:
+            return False
+    elif not (cross(a, next_pt, b) > 0 and cross(a, b, prev_pt) > 0):
+        return False
+    for k in range(n):
+        k2 = (k + 1) % n
+        if k in (i, j) or k2 in (i, j):
+            continue
+        if _segments_touch(a, b, poly[k], poly[k2]):
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Approximate convex decomposition
+# ---------------------------------------------------------------------------
+
+def vertex_depths(poly: list[Point]) -> list[float]:
+    """Depth of every vertex below the convex hull bridge of its pocket (0 on the hull)."""
+    n = len(poly)
+    on_hull = set(graham_scan(poly))
+    hull_idx = [i for i in range(n) if poly[i] in on_hull]
+    depths = [0.0] * n
+    if len(hull_idx) < 2:
+        return depths
+    for k, start in enumerate(hull_idx):
+        end = hull_idx[(k + 1) % len(hull_idx)]
+        (ax, ay), (bx, by) = poly[start], poly[end]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+        i = (start + 1) % n
+        while i != end:
+            depths[i] = segment_distance(poly[i][0], poly[i][1], ax, ay, dx, dy, length_sq)
+            i = (i + 1) % n
+    return depths
+
+
+def _best_split(poly: list[Point], r: int) -> int | None:
+    """Pick the other end of a splitting diagonal from reflex vertex r."""
+    n = len(poly)
+    a, p, b = poly[r - 1], poly[r], poly[(r + 1) % n]
+    best = None
+    best_score = math.inf
+    fallback = None
+    fallback_score = math.inf
+    for j in range(n):
+        if j == r or j == (r - 1) % n or j == (r + 1) % n:
+            continue
+        if not _is_diagonal(poly, r, j):
+            continue
+        v = poly[j]
+        dist = math.hypot(v[0] - p[0], v[1] - p[1])
+        if dist < fallback_score:
+            fallback, fallback_score = j, dist
+        # Inside the wedge of the two edge extensions the diagonal leaves
+        # both angles at r convex
+        if cross(p, b, v) >= 0 and cross(p, v, a) >= 0:
+            score = dist * (0.5 if _is_reflex(poly, j) else 1.0)
+            if score < best_score:
+                best, best_score = j, score
+    return best if best is not None else fallback
+
+
+def decompose(poly: list[Point], concavity: float) -> list[list[Point]]:
+    """Split a counter-clockwise simple polygon into pieces with concavity <= the tolerance."""
+    pieces: list[list[Point]] = []
+    stack = [poly]
+    while stack:
+        piece = stack.pop()
+        if len(piece) <= 3:
+            pieces.append(piece)
+            continue
+        depths = vertex_depths(piece)
+        reflex = [i for i in range(len(piece)) if depths[i] > concavity and _is_reflex(piece, i)]
+        if not reflex:
+            pieces.append(piece)
+            continue
+        r = max(reflex, key=lambda i: depths[i])
+        j = _best_split(piece, r)
+        if j is None:
+            # No clean diagonal (e.g. self-touching contour); keep the piece whole
+            pieces.append(piece)
+            continue
+        if j < r:
+            r, j = j, r
+        stack.append(piece[r:j + 1])
+        stack.append(piece[j:] + piece[:r + 1])
+    return pieces
+
+
+def piece_hulls(
+    pieces: list[list[Point]], max_points: int, min_area: float
+) -> list[list[Point]]:
+    """Convex hull of every piece, capped at max_points; tiny pieces are dropped."""
+    hulls = []
+    for piece in pieces:
+        hull = graham_scan(piece)
+        if len(hull) < 3 or abs(signed_area(hull)) < min_area:
+            continue
+        if len(hull) > max_points:
+            hull = visvalingam_whyatt(hull, max_points=max_points)
+        hulls.append(hull)
+    return hulls
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def write_collisionobject(
+    hulls: list[list[Point]],
+    img_width: int,
+    img_height: int,
+    object_type: str,
+    mass: float,
+    group: str,
+    masks: list[str],
+    friction: float,
+    restitution: float,
+    out: TextIO,
+) -> None:
+    """Write a .collisionobject with one embedded TYPE_HULL shape per hull."""
+    cx = img_width / 2.0
+    cy = img_height / 2.0
+
+    # Center at image origin and flip Y axis; keep counter-clockwise winding in Defold space
+    defold_hulls = [ensure_ccw([(x - cx, cy - y) for x, y in hull]) for hull in hulls]
+
+    out.write(f"type: {OBJECT_TYPES[object_type]}\n")
+    out.write(f"mass: {format_float(mass)}\n")
+    out.write(f"friction: {format_float(friction)}\n")
+    out.write(f"restitution: {format_float(restitution)}\n")
+    out.write(f'group: "{group}"\n')
+    for m in masks:
+        out.write(f'mask: "{m}"\n')
+
+    out.write("embedded_collision_shape {\n")
+
+    data_index = 0
+    for hull in defold_hulls:
+        out.write("  shapes {\n")
+        out.write("    shape_type: TYPE_HULL\n")
+        out.write("    position {\n")
+        out.write("    }\n")
+        out.write("    rotation {\n")
+        out.write("    }\n")
+        out.write(f"    index: {data_index}\n")
+        out.write(f"    count: {len(hull) * 3}\n")
+        out.write("  }\n")
+        data_index += len(hull) * 3
+
+    for hull in defold_hulls:
+        for x, y in hull:
+            out.write(f"  data: {format_float(x)}\n")
+            out.write(f"  data: {format_float(y)}\n")
+            out.write("  data: 0.0\n")
+
+    out.write("}\n")
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Generate a Defold .collisionobject that covers a concave silhouette "
+            "with a few convex TYPE_HULL shapes."
+        )
+    )
+    parser.add_argument("image_path", help="Path to a PNG or JPEG image file")
+    parser.add_argument("--output", "-o",
+                        help="Output .collisionobject file path (default: stdout)")
+    parser.add_argument("--concavity", "-c", type=float, default=4.0,
+                        help="Allowed concavity per convex piece in pixels (default: 4.0)")
+    parser.add_argument("--epsilon", "-e", type=float, default=1.0,
+                        help="RDP contour simplification tolerance in pixels (default: 1.0)")
+    parser.add_argument("--max-points", "-m", type=int, default=16,
+                        help="Maximum vertices per hull (default: 16)")
+    parser.add_argument("--min-area", type=float, default=4.0,
+                        help="Drop pieces smaller than this many square pixels (default: 4.0)")
+    parser.add_argument("--alpha-threshold", "-a", type=int, default=1,
+                        help="Alpha threshold for non-transparent pixels (0-255, default: 1)")
+    parser.add_argument("--force-png-py", action="store_true",
+                        help="Force using bundled png.py instead of PIL (PNG only)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not use the decoded alpha cache (same as DEFOLD_MASK_CACHE=0)")
+    parser.add_argument("--scale", type=parse_scale, default=1.0,
+                        help="Build the mask at reduced resolution, 0 < S <= 1, e.g. 0.25 = 4x4 pixel cells; "
+                             "1/S is rounded half up (default: 1)")
+    parser.add_argument("--max-dim", type=int, default=None,
+                        help="Reduce resolution so the longest mask side is at most this many cells")
+    parser.add_argument("--roi", type=parse_roi, default=None, metavar="X,Y,W,H",
+                        help="Only use this region of the image (pixels); output stays in sprite coordinates")
+    parser.add_argument("--type", choices=sorted(OBJECT_TYPES), default="static",
+                        help="Collision object type (default: static)")
+    parser.add_argument("--mass", type=float, default=None,
+                        help="Mass (default: 1.0 for dynamic objects, 0.0 otherwise)")
+    parser.add_argument("--group", "-g", default="default",
+                        help='Collision group (default: "default")')
+    parser.add_argument("--mask", action="append", default=None,
+                        help='Collision mask group (repeatable, default: "default")')
+    parser.add_argument("--friction", type=float, default=0.1,
+                        help="Friction coefficient (default: 0.1)")
+    parser.add_argument("--restitution", type=float, default=0.5,
+                        help="Restitution / bounciness (default: 0.5)")
+    args = parser.parse_args()
+
+    if args.max_points < 3:
+        print("ERROR: --max-points must be at least 3", file=sys.stderr)
+        return 1
+    masks = args.mask if args.mask else ["default"]
+    mass = args.mass if args.mass is not None else (1.0 if args.type == "dynamic" else 0.0)
+
+    # Load image
+    try:
+        mask = load_mask(
+            args.image_path, args.alpha_threshold,
+            force_png_py=args.force_png_py,
+            cache=False if args.no_cache else None,
+            scale=args.scale, max_dim=args.max_dim, roi=args.roi,
+        )
+    except Exception as e:
+        print(f"ERROR: Failed to read image: {e}", file=sys.stderr)
+        return 1
+
+    frame = mask.frame
+    width, height = frame.source_width, frame.source_height
+    print(f"Image: {args.image_path} ({width}x{height})", file=sys.stderr)
+
+    # Trace and simplify contours (in source pixel space)
+    contours = extract_contours(mask)
+    if not frame.is_identity():
+        contours = [[frame.to_source(x, y) for x, y in contour] for contour in contours]
+        if args.epsilon < frame.scale:
+            print(
+                f"NOTE: --epsilon {args.epsilon} is below the {frame.scale} px cell size; "
+                "cell staircase steps will be kept and split into many small pieces",
+                file=sys.stderr,
+            )
+    polygons = [simplify_contour(c, args.epsilon)[:-1] for c in contours]
+    outer = [p for p in polygons if signed_area(p) > 0]
+    holes = len(polygons) - len(outer)
+    if not outer:
+        print("ERROR: No contours found in image", file=sys.stderr)
+        return 1
+    print(
+        f"Contours: {len(outer)} outer loop(s), {sum(len(p) for p in outer)} vertices "
+        f"(epsilon={args.epsilon})",
+        file=sys.stderr,
+    )
+    if holes:
+        print(f"NOTE: {holes} hole(s) are filled by the convex pieces", file=sys.stderr)
+
+    # Decompose each outer loop
+    pieces = [piece for poly in outer for piece in decompose(poly, args.concavity)]
+    hulls = piece_hulls(pieces, args.max_points, args.min_area)
+    if not hulls:
+        print("ERROR: All pieces are smaller than --min-area", file=sys.stderr)
+        return 1
+    print(
+        f"Convex pieces: {len(hulls)} (concavity={args.concavity}, "
+        f"max {max(len(h) for h in hulls)} vertices)",
+        file=sys.stderr,
+    )
+
+    # Write output
+    if args.output:
+        with open(args.output, "w", newline="\n") as f:
+            write_collisionobject(
+                hulls, width, height, args.type, mass,
+                args.group, masks, args.friction, args.restitution, f,
+            )
+        print(f"Written: {args.output}", file=sys.stderr)
+    else:
+        write_collisionobject(
+            hulls, width, height, args.type, mass,
+            args.group, masks, args.friction, args.restitution, sys.stdout,
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,55 +3,113 @@
 """Generate a Defold .convexshape file from a 2D image's non-transparent silhouette.
 
 Uses PIL/Pillow (bundled with most Python installations) to read images.
-Computes a convex hull via Graham scan, simplifies to ≤16 points
-using Visvalingam-Whyatt area-based simplification, centers points
-at image origin, and outputs Defold-compatible .convexshape format.
+Computes a convex hull via Graham scan over the pixel corners of each row's
+opaque extent (at most 4 points per row), merges hull corners that sit
+one pixel apart, simplifies to ≤16 points using Visvalingam-Whyatt
+area-based simplification, centers points at image origin, and outputs
+Defold-compatible .convexshape format.
 
 Usage:
     python gen_convexshape.py <image_path> [--output <output_path>] [--max-points N] [--alpha-threshold T]
+    python gen_convexshape.py <atlas_or_glob> [--output-dir <dir>] [--workers N] [--force]
 
 Arguments:
-    image_path          Path to a PNG or JPEG image file
+    image_path          Path to a PNG or JPEG image file, or a .atlas / glob
+                        pattern (quoted) for batch mode
     --output, -o        Output .convexshape file path (default: prints to stdout)
     --max-points, -m    Maximum number of hull points (default: 16, Box2D limit in Defold)
     --alpha-threshold   Alpha value threshold for "non-transparent" (0-255, default: 1)
+    --inset, -i         Inset percentage to shrink the shape toward its centroid (default: 0)
     --force-png-py      Force using bundled png.py instead of PIL (PNG only)
+    --no-cache          Do not use the decoded alpha cache
+    --scale, --max-dim  Build the mask at reduced resolution (see image_loader)
+    --roi X,Y,W,H       Only use this region of the image
+    --max-error P       Use the fewest hull points (up to --max-points) whose hull
+                        misses at most P percent of the non-transparent area more
+                        than the full hull does
+    --fit               Emit a TYPE_SPHERE or TYPE_BOX instead of the hull when it
+                        matches the silhouette within --fit-tolerance
+    --fit-tolerance P   Allowed coverage error for --fit, in percent of the
+                        non-transparent area (default: 5)
+
+Batch mode:
+    Writes <image name>.convexshape for every image of the atlas (resource
+    paths are resolved against the directory holding game.project) or glob,
+    using a process pool.  A manifest records each image's SHA-1 and the
+    shape options; images whose entry is unchanged and whose output exists
+    are skipped on the next run.  A manifest can be shared by several atlases
+    or globs; each run only replaces the entries of its own images.  With
+    --fit, the component position/rotation of a sphere or box is printed
+    after its output and stored in the manifest entry ("placement"), and
+    printed again for skipped images.
+    --output-dir, -d    Directory for the outputs (default: next to each image)
+    --manifest PATH     Manifest file (default: .convexshape-manifest.json in the
+                        output directory, next to the atlas, or in the cwd)
+    --workers, -w       Worker processes (default: CPU count)
+    --force             Regenerate everything
 
 Environment:
     FORCE_PNG_PY=1      Same as --force-png-py
+    DEFOLD_MASK_CACHE=0 Same as --no-cache
 
 Output:
     Protobuf Text Format .convexshape with TYPE_HULL shape, points centered at image origin.
+    With --fit, a sphere or box may be written instead.  A .convexshape has no
+    position, so the component offset that centers the primitive on the sprite
+    (and the rotation of a box) is printed to stderr.
+
+Primitive fitting:
+    Candidates are the minimum enclosing circle (Welzl), the minimum-area
+    enclosing rectangle (one side collinear with a hull edge) and the hull.
+    Each is scanline-rasterized against the mask; the error is the number of
+    cells where shape and mask disagree, relative to the non-transparent count.
+    The cheapest candidate (sphere < box < hull) within tolerance wins.
+    Capsules are not considered: TYPE_CAPSULE is only supported by 3D physics.
 
 Exit code 0 on success, 1 on error.
 """
 
 import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
 import math
 import os
+import random
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from typing import TextIO
 
 # image_loader is in the same directory; adjust sys.path so it's importable
 # both when invoked directly and from the editor script.
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from image_loader import load_alpha_mask
-
-
-def extract_boundary_pixels(coords: list[tuple[int, int]], width: int, height: int) -> list[tuple[int, int]]:
-    """Extract only boundary pixels from the silhouette to reduce point count before hull."""
-    pixel_set = set(coords)
-    boundary = []
-    for x, y in coords:
-        is_boundary = False
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = x + dx, y + dy
-            if nx < 0 or nx >= width or ny < 0 or ny >= height or (nx, ny) not in pixel_set:
-                is_boundary = True
-                break
-        if is_boundary:
-            boundary.append((x, y))
-    return boundary
+from image_loader import Spans, load_spans, parse_roi, parse_scale
+from simplify import triangle_area, visvalingam_whyatt, vw_removal_order
+
+
+def row_extent_corners(spans: Spans) -> list[tuple[float, float]]:
+    """Hull input: the outer pixel corners of every row's opaque extent.
+
+    Pixel (x, y) covers the square [x, x+1] x [y, y+1].  The convex hull of a
+    silhouette only depends on the leftmost and rightmost opaque pixel of each
+    row, so at most 4 points per row are needed.  Points are returned in
+    source pixel space (see image_loader.Frame).
+    """
+    to_source = spans.frame.to_source
+    points: list[tuple[float, float]] = []
+    for y, row in enumerate(spans.rows):
+        if not row:
+            continue
+        x_left = row[0][0]
+        x_right = row[-1][1]
+        points.extend((
+            to_source(x_left, y), to_source(x_left, y + 1),
+            to_source(x_right, y), to_source(x_right, y + 1),
+        ))
+    return points
 
 
 def cross(o: tuple[float, float], a: tuple[float, float], b: tuple[float, float]) -> float:
@@ -86,40 +144,42 @@ def graham_scan(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
     return lower[:-1] + upper[:-1]
 
 
-def triangle_area(a: tuple[float, float], b: tuple[float, float], c: tuple[float, float]) -> float:
-    """Area of triangle formed by three points."""
-    return abs(cross(a, b, c)) / 2.0
+def merge_close_vertices(hull: list[tuple[float, float]], min_edge: float) -> list[tuple[float, float]]:
+    """Drop one end of every hull edge no longer than min_edge.
+
+    The two pixel corners of a row extent often both land on the hull one
+    pixel apart; such pairs carry no shape information but would spend the
+    vertex budget.  Of the two ends, the one whose removal cuts off the
+    smaller triangle goes, so the hull shrinks by less than one pixel.
+    At least 3 vertices are kept.
+    """
+    pts = list(hull)
+    limit = min_edge * min_edge + 1e-9
+    i = 0
+    while len(pts) > 3 and i < len(pts):
+        n = len(pts)
+        a, b = pts[i], pts[(i + 1) % n]
+        if (b[0] - a[0]) ** 2 + (b[1] - a[1]) ** 2 > limit:
+            i += 1
+            continue
+        area_a = triangle_area(pts[i - 1], a, b)
+        area_b = triangle_area(a, b, pts[(i + 2) % n])
+        del pts[i if area_a <= area_b else (i + 1) % n]
+        # Re-check the edge that now starts before the removed vertex
+        i = max(i - 1, 0)
+    return pts
 
 
 def simplify_hull(hull: list[tuple[float, float]], max_points: int) -> list[tuple[float, float]]:
     """Reduce hull to max_points using Visvalingam-Whyatt area-based simplification.
 
-    Iteratively removes the vertex that contributes the least area
-    to the polygon until we have at most max_points vertices.
+    Repeatedly removes the vertex that contributes the least area to the
+    polygon (heap-based, see simplify.py) until at most max_points remain.
     Preserves counter-clockwise winding order.
     """
     if len(hull) <= max_points:
         return hull
-
-    pts = list(hull)
-
-    while len(pts) > max_points:
-        n = len(pts)
-        min_area = float("inf")
-        min_idx = -1
-
-        for i in range(n):
-            prev_pt = pts[(i - 1) % n]
-            curr_pt = pts[i]
-            next_pt = pts[(i + 1) % n]
-            area = triangle_area(prev_pt, curr_pt, next_pt)
-            if area < min_area:
-                min_area = area
-                min_idx = i
-
-        pts.pop(min_idx)
-
-    return pts
+    return visvalingam_whyatt(hull, max_points=max_points)
 
 
 def ensure_ccw(hull: list[tuple[float, float]]) -> list[tuple[float, float]]:
@@ -135,6 +195,211 @@ def ensure_ccw(hull: list[tuple[float, float]]) -> list[tuple[float, float]]:
     return hull
 
 
+# ---------------------------------------------------------------------------
+# Primitive fitting (--fit)
+# ---------------------------------------------------------------------------
+
+def _circle_contains(circle: tuple[float, float, float], p: tuple[float, float]) -> bool:
+    cx, cy, r = circle
+    return math.hypot(p[0] - cx, p[1] - cy) <= r + 1e-7
+
+
+def _circle_two(a: tuple[float, float], b: tuple[float, float]) -> tuple[float, float, float]:
+    cx = (a[0] + b[0]) / 2.0
+    cy = (a[1] + b[1]) / 2.0
+    return cx, cy, math.hypot(a[0] - cx, a[1] - cy)
+
+
+def _circle_three(
+    a: tuple[float, float], b: tuple[float, float], c: tuple[float, float]
+) -> tuple[float, float, float] | None:
+    d = 2.0 * cross(a, b, c)
+    if d == 0.0:
+        return None
+    bx, by = b[0] - a[0], b[1] - a[1]
+    cx, cy = c[0] - a[0], c[1] - a[1]
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+    ux = (cy * b2 - by * c2) / d
+    uy = (bx * c2 - cx * b2) / d
+    return a[0] + ux, a[1] + uy, math.hypot(ux, uy)
+
+
+def min_enclosing_circle(points: list[tuple[float, float]]) -> tuple[float, float, float]:
+    """Smallest circle (cx, cy, r) containing all points (Welzl, iterative, expected O(n))."""
+    pts = list(points)
+    random.Random(0).shuffle(pts)
+    circle = (pts[0][0], pts[0][1], 0.0)
+    for i, p in enumerate(pts):
+        if _circle_contains(circle, p):
+            continue
+        circle = (p[0], p[1], 0.0)
+        for j in range(i):
+            q = pts[j]
+            if _circle_contains(circle, q):
+                continue
+            circle = _circle_two(p, q)
+            for k in range(j):
+                t = pts[k]
+                if not _circle_contains(circle, t):
+                    circle = _circle_three(p, q, t) or circle
+    return circle
+
+
+def min_area_rect(hull: list[tuple[float, float]]) -> tuple[float, float, float, float, float]:
+    """Minimum-area enclosing rectangle of a convex hull: (cx, cy, half_w, half_h, angle).
+
+    One side of the optimal rectangle is collinear with a hull edge (the
+    rotating calipers theorem), so every edge direction is tried.  The angle
+    (radians, pixel space) is normalized to [-pi/4, pi/4).
+    """
+    best = None
+    n = len(hull)
+    for i in range(n):
+        x1, y1 = hull[i]
+        x2, y2 = hull[(i + 1) % n]
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length == 0.0:
+            continue
+        ux, uy = (x2 - x1) / length, (y2 - y1) / length
+        us = [x * ux + y * uy for x, y in hull]
+        vs = [-x * uy + y * ux for x, y in hull]
+        area = (max(us) - min(us)) * (max(vs) - min(vs))
+        if best is None or area < best[0]:
+            best = (area, ux, uy, min(us), max(us), min(vs), max(vs))
+    _area, ux, uy, u0, u1, v0, v1 = best
+    um = (u0 + u1) / 2.0
+    vm = (v0 + v1) / 2.0
+    cx = um * ux - vm * uy
+    cy = um * uy + vm * ux
+    half_w = (u1 - u0) / 2.0
+    half_h = (v1 - v0) / 2.0
+    angle = math.atan2(uy, ux)
+    # Rotate by quarter turns into [-pi/4, pi/4), swapping the extents
+    while angle >= math.pi / 4:
+        angle -= math.pi / 2
+        half_w, half_h = half_h, half_w
+    while angle < -math.pi / 4:
+        angle += math.pi / 2
+        half_w, half_h = half_h, half_w
+    return cx, cy, half_w, half_h, angle
+
+
+def rect_corners(cx: float, cy: float, half_w: float, half_h: float, angle: float) -> list[tuple[float, float]]:
+    """Corners of an oriented rectangle."""
+    c, s = math.cos(angle), math.sin(angle)
+    return [
+        (cx + dx * c - dy * s, cy + dx * s + dy * c)
+        for dx, dy in ((-half_w, -half_h), (half_w, -half_h), (half_w, half_h), (-half_w, half_h))
+    ]
+
+
+def polygon_row_interval(poly: list[tuple[float, float]], y: float) -> tuple[float, float] | None:
+    """x extent of a convex polygon on the horizontal line at y, or None."""
+    xs = []
+    n = len(poly)
+    for i in range(n):
+        (x1, y1), (x2, y2) = poly[i], poly[(i + 1) % n]
+        if (y1 <= y < y2) or (y2 <= y < y1):
+            xs.append(x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+    return (min(xs), max(xs)) if xs else None
+
+
+def circle_row_interval(circle: tuple[float, float, float], y: float) -> tuple[float, float] | None:
+    """x extent of a circle on the horizontal line at y, or None."""
+    cx, cy, r = circle
+    dy = y - cy
+    if abs(dy) > r:
+        return None
+    half = math.sqrt(r * r - dy * dy)
+    return cx - half, cx + half
+
+
+def coverage_counts(spans: Spans, row_interval, y_min: float, y_max: float) -> tuple[int, int]:
+    """Compare a convex shape with the mask by scanline rasterization.
+
+    row_interval(y) gives the shape's x extent on a source-space horizontal
+    line, which only needs to be evaluated between y_min and y_max; a cell
+    belongs to the shape when its centre lies inside.  Returns (outside,
+    missed): shape cells that are transparent, and opaque cells not covered.
+    """
+    frame = spans.frame
+    scale = frame.scale
+    outside = missed = 0
+    first = math.floor((y_min - frame.y) / scale)
+    last = math.ceil((y_max - frame.y) / scale)
+    for y in range(min(first, 0), max(last, spans.height)):
+        row = spans.rows[y] if 0 <= y < spans.height else []
+        row_count = sum(x_end - x_start for x_start, x_end in row)
+        interval = row_interval(frame.y + (y + 0.5) * scale)
+        if interval is None:
+            missed += row_count
+            continue
+        # Cells whose centre lies in [x0, x1]
+        c0 = math.ceil((interval[0] - frame.x) / scale - 0.5)
+        c1 = math.floor((interval[1] - frame.x) / scale - 0.5) + 1
+        if c1 <= c0:
+            missed += row_count
+            continue
+        overlap = sum(max(0, min(x_end, c1) - max(x_start, c0)) for x_start, x_end in row)
+        outside += c1 - c0 - overlap
+        missed += row_count - overlap
+    return outside, missed
+
+
+def coverage_error(spans: Spans, row_interval, y_min: float, y_max: float) -> int:
+    """Cells where a convex shape and the mask disagree."""
+    return sum(coverage_counts(spans, row_interval, y_min, y_max))
+
+
+def hull_missed(spans: Spans, hull: list[tuple[float, float]]) -> int:
+    """Opaque cells not covered by a convex polygon."""
+    y_min = min(y for x, y in hull)
+    y_max = max(y for x, y in hull)
+    return coverage_counts(spans, lambda y: polygon_row_interval(hull, y), y_min, y_max)[1]
+
+
+def min_vertex_hull(
+    hull: list[tuple[float, float]], spans: Spans, max_error: int, max_points: int
+) -> tuple[list[tuple[float, float]], int]:
+    """Fewest-vertex simplification of the hull that stays within max_error.
+
+    The candidates are the prefixes of the Visvalingam-Whyatt removal order,
+    i.e. the hulls simplify_hull would return for each vertex count.  They
+    are nested, so the opaque cells lost compared to the full hull only grow
+    as vertices are removed and the smallest count is found by binary search.
+    Returns (hull, lost cells); never more than max_points vertices.
+    """
+    n = len(hull)
+    order = [i for i, _area in vw_removal_order(hull)]
+
+    def simplified(count: int) -> list[tuple[float, float]]:
+        removed = set(order[: n - count])
+        return [p for i, p in enumerate(hull) if i not in removed]
+
+    base = hull_missed(spans, hull)
+    hi = max(3, min(n, max_points))
+    best = simplified(hi)
+    best_error = hull_missed(spans, best) - base
+    lo = 3
+    while lo < hi:
+        mid = (lo + hi) // 2
+        candidate = simplified(mid)
+        error = hull_missed(spans, candidate) - base
+        if error <= max_error:
+            hi, best, best_error = mid, candidate, error
+        else:
+            lo = mid + 1
+    return best, best_error
+
+
+def write_primitive(shape_type: str, data: list[float], out: TextIO) -> None:
+    """Write a TYPE_SPHERE / TYPE_BOX .convexshape."""
+    out.write(f"shape_type: {shape_type}\n")
+    for v in data:
+        out.write(f"data: {format_float(v)}\n")
+
+
 def write_convexshape(hull: list[tuple[float, float]], out: TextIO) -> None:
     """Write hull points as Defold .convexshape format (TYPE_HULL with z=0)."""
     out.write("shape_type: TYPE_HULL\n")
@@ -164,55 +429,313 @@ def write_convexshape_formatted(hull: list[tuple[float, float]], out: TextIO) ->
         out.write("data: 0.0\n")
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Generate a Defold .convexshape file from an image's non-transparent silhouette."
-    )
-    parser.add_argument("image_path", help="Path to a PNG or JPEG image file")
-    parser.add_argument("--output", "-o", help="Output .convexshape file path (default: stdout)")
-    parser.add_argument("--max-points", "-m", type=int, default=16,
-                        help="Maximum number of hull points (default: 16)")
-    parser.add_argument("--alpha-threshold", "-a", type=int, default=1,
-                        help="Alpha threshold for non-transparent pixels (0-255, default: 1)")
-    parser.add_argument("--inset", "-i", type=float, default=0.0,
-                        help="Inset percentage to shrink the shape (0-100, default: 0)")
-    parser.add_argument("--force-png-py", action="store_true",
-                        help="Force using bundled png.py instead of PIL (PNG only)")
-    args = parser.parse_args()
+# ---------------------------------------------------------------------------
+# Batch mode (.atlas or glob)
+# ---------------------------------------------------------------------------
+
+# Bump when the generated shapes change for the same input and options,
+# so batch runs regenerate everything listed in an older manifest.
+GENERATOR_VERSION = 2
+MANIFEST_NAME = ".convexshape-manifest.json"
+
+# Log lines of a --fit primitive that place it on the component; kept in the
+# manifest since a skipped image does not print them again
+_PLACEMENT_PREFIXES = ("Component position: ", "Component rotation: ")
+
+# Options that affect the generated shape (part of the manifest key)
+_SHAPE_OPTIONS = (
+    "max_points", "alpha_threshold", "inset", "scale", "max_dim", "roi",
+    "max_error", "fit", "fit_tolerance",
+)
 
+_ATLAS_IMAGE_RE = re.compile(r'\bimage:\s*"([^"]+)"')
+
+
+def is_batch_input(path: str) -> bool:
+    """True for a .atlas file or a glob pattern (an existing file named like a glob is not)."""
+    if path.endswith(".atlas"):
+        return True
+    return not os.path.isfile(path) and glob.has_magic(path)
+
+
+def find_project_root(start: str) -> str:
+    """Nearest directory at or above start containing game.project (default: cwd)."""
+    current = os.path.abspath(start)
+    while True:
+        if os.path.isfile(os.path.join(current, "game.project")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return os.getcwd()
+        current = parent
+
+
+def atlas_images(atlas_path: str) -> list[str]:
+    """Image files referenced by an atlas (images and animation frames), in order."""
+    with open(atlas_path, encoding="utf-8") as f:
+        text = f.read()
+    root = find_project_root(os.path.dirname(atlas_path))
+    paths = [os.path.join(root, image.lstrip("/")) for image in _ATLAS_IMAGE_RE.findall(text)]
+    return list(dict.fromkeys(paths))
+
+
+def batch_inputs(pattern: str) -> list[str]:
+    """Images of a .atlas file or matching a glob pattern."""
+    if pattern.endswith(".atlas"):
+        return atlas_images(pattern)
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def file_hash(path: str) -> str:
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def shape_params(args: argparse.Namespace) -> dict:
+    """Options that determine the generated shape, as stored in the manifest."""
+    params = {name: getattr(args, name) for name in _SHAPE_OPTIONS}
+    params["version"] = GENERATOR_VERSION
+    # Round-trip so tuples compare equal to the lists read back from JSON
+    return json.loads(json.dumps(params))
+
+
+def load_manifest(path: str) -> dict:
+    """Load a batch manifest, or return an empty one."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"entries": {}}
+    if not isinstance(manifest.get("entries"), dict):
+        return {"entries": {}}
+    return manifest
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    """Write a batch manifest atomically."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _batch_job(args: argparse.Namespace, image_path: str, output: str) -> tuple[int, str]:
+    """Generate one shape in a worker; returns (exit code, captured log)."""
+    log = io.StringIO()
+    with contextlib.redirect_stderr(log):
+        try:
+            code = generate(args, image_path, output)
+        except Exception as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            code = 1
+    return code, log.getvalue()
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """Generate one .convexshape per image of an atlas or glob, skipping unchanged ones.
+
+    The manifest may be shared by several atlases or globs, so only the
+    entries of this run's images are replaced.  Placement lines of fitted
+    primitives are stored with the entry and printed even for skipped images.
+    """
+    if args.output:
+        print("ERROR: --output writes a single file; use --output-dir in batch mode", file=sys.stderr)
+        return 1
+    try:
+        images = batch_inputs(args.image_path)
+    except OSError as e:
+        print(f"ERROR: Failed to read atlas: {e}", file=sys.stderr)
+        return 1
+    if not images:
+        print(f"ERROR: No images found for: {args.image_path}", file=sys.stderr)
+        return 1
+
+    outputs = []
+    for image in images:
+        name = os.path.splitext(os.path.basename(image))[0] + ".convexshape"
+        outputs.append(os.path.join(args.output_dir or os.path.dirname(image), name))
+    duplicates = {o for o in outputs if outputs.count(o) > 1}
+    if duplicates:
+        print(f"ERROR: Several images map to: {', '.join(sorted(duplicates))}", file=sys.stderr)
+        return 1
+
+    if args.manifest:
+        manifest_path = args.manifest
+    elif args.output_dir:
+        manifest_path = os.path.join(args.output_dir, MANIFEST_NAME)
+    elif args.image_path.endswith(".atlas"):
+        manifest_path = os.path.join(os.path.dirname(os.path.abspath(args.image_path)), MANIFEST_NAME)
+    else:
+        manifest_path = MANIFEST_NAME
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    manifest = load_manifest(manifest_path)
+    entries = manifest["entries"]
+    params = shape_params(args)
+    jobs = []
+    kept_placement = []
+    skipped = generated = failed = 0
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    for image, output in zip(images, outputs):
+        key = os.path.relpath(output, manifest_dir)
+        try:
+            digest = file_hash(image)
+        except OSError as e:
+            print(f"ERROR: {image}: {e}", file=sys.stderr)
+            entries.pop(key, None)
+            failed += 1
+            continue
+        entry = {"image": os.path.relpath(image, manifest_dir), "sha1": digest, "params": params}
+        previous = entries.get(key) or {}
+        if not args.force and {name: previous.get(name) for name in entry} == entry and os.path.exists(output):
+            skipped += 1
+            kept_placement += [f"{output}: {line}" for line in previous.get("placement", [])]
+            continue
+        jobs.append((key, entry, image, output))
+
+    print(f"Batch: {len(images)} image(s), {skipped} unchanged, {len(jobs)} to generate", file=sys.stderr)
+    for line in kept_placement:
+        print(line, file=sys.stderr)
+    if jobs:
+        workers = max(1, min(args.workers or os.cpu_count() or 1, len(jobs)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_batch_job, args, image, output) for _key, _entry, image, output in jobs]
+            for (key, entry, image, output), future in zip(jobs, futures):
+                code, log = future.result()
+                if code == 0:
+                    placement = [line for line in log.splitlines() if line.startswith(_PLACEMENT_PREFIXES)]
+                    if placement:
+                        entry["placement"] = placement
+                    entries[key] = entry
+                    generated += 1
+                    print(f"Written: {output}", file=sys.stderr)
+                    for line in placement:
+                        print(f"{output}: {line}", file=sys.stderr)
+                else:
+                    entries.pop(key, None)
+                    failed += 1
+                    sys.stderr.write(f"{image}:\n{log}")
+
+    save_manifest(manifest_path, manifest)
+    print(f"Batch: {generated} generated, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def generate(args: argparse.Namespace, image_path: str, output: str | None) -> int:
+    """Generate one .convexshape (stdout when output is None) with the parsed options."""
     # Load image and get non-transparent pixels
     try:
-        coords, width, height = load_alpha_mask(
-            args.image_path, args.alpha_threshold,
+        spans = load_spans(
+            image_path, args.alpha_threshold,
             force_png_py=args.force_png_py,
+            cache=False if args.no_cache else None,
+            scale=args.scale, max_dim=args.max_dim, roi=args.roi,
         )
     except Exception as e:
         print(f"ERROR: Failed to read image: {e}", file=sys.stderr)
         return 1
 
-    if len(coords) < 3:
+    frame = spans.frame
+    width, height = frame.source_width, frame.source_height
+    opaque = spans.count()
+    if opaque < 3:
         print("ERROR: Not enough non-transparent pixels to form a convex hull (need at least 3)", file=sys.stderr)
         return 1
 
-    print(f"Image: {args.image_path} ({width}x{height})", file=sys.stderr)
-    print(f"Non-transparent pixels: {len(coords)}", file=sys.stderr)
+    print(f"Image: {image_path} ({width}x{height})", file=sys.stderr)
+    if not frame.is_identity():
+        print(
+            f"Mask: {spans.width}x{spans.height} cells of {frame.scale}x{frame.scale} px "
+            f"(region {frame.x},{frame.y} {frame.width}x{frame.height})",
+            file=sys.stderr,
+        )
+    print(f"Non-transparent {'pixels' if frame.scale == 1 else 'cells'}: {opaque}", file=sys.stderr)
 
-    # Extract boundary pixels to speed up hull computation
-    boundary = extract_boundary_pixels(coords, width, height)
-    print(f"Boundary pixels: {len(boundary)}", file=sys.stderr)
+    # Hull input: outer pixel corners of each row's opaque extent
+    corners = row_extent_corners(spans)
+    print(f"Row-extent corners: {len(corners)}", file=sys.stderr)
 
     # Compute convex hull (in pixel coordinates, Y grows down)
-    hull = graham_scan([(float(x), float(y)) for x, y in boundary])
+    hull = graham_scan([(float(x), float(y)) for x, y in corners])
     print(f"Convex hull vertices: {len(hull)}", file=sys.stderr)
-
-    # Simplify to max points
-    if len(hull) > args.max_points:
+    merged = merge_close_vertices(hull, float(frame.scale))
+    if len(merged) < len(hull):
+        hull = merged
+        print(f"After merging pixel-adjacent corners: {len(hull)}", file=sys.stderr)
+    full_hull = hull
+
+    # Simplify to max points, or to the fewest points within --max-error
+    if args.max_error is not None:
+        allowed = int(args.max_error / 100.0 * opaque)
+        hull, error = min_vertex_hull(hull, spans, allowed, args.max_points)
+        print(
+            f"Max error {args.max_error:g}%: {len(hull)} vertices, "
+            f"error {100.0 * error / opaque:.2f}% ({error} cells)",
+            file=sys.stderr,
+        )
+        if error > allowed:
+            print(f"NOTE: --max-points {args.max_points} is too few to reach --max-error", file=sys.stderr)
+    elif len(hull) > args.max_points:
         hull = simplify_hull(hull, args.max_points)
         print(f"Simplified to: {len(hull)} vertices", file=sys.stderr)
 
     # Center at image origin and flip Y axis (pixel Y grows down, Defold Y grows up)
     cx = width / 2.0
     cy = height / 2.0
+
+    if args.fit:
+        y_min = min(y for x, y in full_hull)
+        y_max = max(y for x, y in full_hull)
+        circle = min_enclosing_circle(full_hull)
+        rect = min_area_rect(full_hull)
+        corners_rect = rect_corners(*rect)
+        candidates = [
+            ("sphere", coverage_error(spans, lambda y: circle_row_interval(circle, y),
+                                      circle[1] - circle[2], circle[1] + circle[2])),
+            ("box", coverage_error(spans, lambda y: polygon_row_interval(corners_rect, y),
+                                   min(y for x, y in corners_rect), max(y for x, y in corners_rect))),
+            ("hull", coverage_error(spans, lambda y: polygon_row_interval(hull, y), y_min, y_max)),
+        ]
+        chosen = "hull"
+        for name, error in candidates:
+            percent = 100.0 * error / opaque
+            print(f"Fit {name}: error {percent:.2f}% ({error} cells)", file=sys.stderr)
+        for name, error in candidates:
+            if 100.0 * error / opaque <= args.fit_tolerance:
+                chosen = name
+                break
+
+        shrink = 1.0 - args.inset / 100.0
+        if chosen != "hull":
+            if chosen == "sphere":
+                px, py, angle = circle[0], circle[1], 0.0
+                shape_type, data = "TYPE_SPHERE", [circle[2] * shrink]
+            else:
+                px, py, angle = rect[0], rect[1], rect[4]
+                shape_type, data = "TYPE_BOX", [rect[2] * shrink, rect[3] * shrink, 10.0]
+            # Defold Y grows up, so a clockwise pixel rotation is counter-clockwise in Defold
+            half = -angle / 2.0
+            print(f"Fit: {chosen} (tolerance {args.fit_tolerance:g}%)", file=sys.stderr)
+            print(f"Component position: {format_float(px - cx)}, {format_float(cy - py)}", file=sys.stderr)
+            print(
+                f"Component rotation: z {format_float(math.sin(half))}, w {format_float(math.cos(half))} "
+                f"({format_float(math.degrees(-angle))} degrees)",
+                file=sys.stderr,
+            )
+            if output:
+                with open(output, "w", newline="\n") as f:
+                    write_primitive(shape_type, data, f)
+                print(f"Written: {output}", file=sys.stderr)
+            else:
+                write_primitive(shape_type, data, sys.stdout)
+            return 0
+        print("Fit: hull", file=sys.stderr)
+
     centered_hull = [(x - cx, cy - y) for x, y in hull]
 
     # Apply inset: shrink each point toward centroid by percentage
@@ -229,15 +752,62 @@ def main() -> int:
     centered_hull = ensure_ccw(centered_hull)
 
     # Write output
-    if args.output:
-        with open(args.output, "w", newline="\n") as f:
+    if output:
+        with open(output, "w", newline="\n") as f:
             write_convexshape_formatted(centered_hull, f)
-        print(f"Written: {args.output}", file=sys.stderr)
+        print(f"Written: {output}", file=sys.stderr)
     else:
         write_convexshape_formatted(centered_hull, sys.stdout)
 
     return 0
 
 
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate a Defold .convexshape file from an image's non-transparent silhouette."
+    )
+    parser.add_argument("image_path",
+                        help="Path to a PNG or JPEG image file, or a .atlas / glob pattern for batch mode")
+    parser.add_argument("--output", "-o", help="Output .convexshape file path (default: stdout)")
+    parser.add_argument("--max-points", "-m", type=int, default=16,
+                        help="Maximum number of hull points (default: 16)")
+    parser.add_argument("--alpha-threshold", "-a", type=int, default=1,
+                        help="Alpha threshold for non-transparent pixels (0-255, default: 1)")
+    parser.add_argument("--inset", "-i", type=float, default=0.0,
+                        help="Inset percentage to shrink the shape (0-100, default: 0)")
+    parser.add_argument("--force-png-py", action="store_true",
+                        help="Force using bundled png.py instead of PIL (PNG only)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not use the decoded alpha cache (same as DEFOLD_MASK_CACHE=0)")
+    parser.add_argument("--scale", type=parse_scale, default=1.0,
+                        help="Build the mask at reduced resolution, 0 < S <= 1, e.g. 0.25 = 4x4 pixel cells; "
+                             "1/S is rounded half up (default: 1)")
+    parser.add_argument("--max-dim", type=int, default=None,
+                        help="Reduce resolution so the longest mask side is at most this many cells")
+    parser.add_argument("--roi", type=parse_roi, default=None, metavar="X,Y,W,H",
+                        help="Only use this region of the image (pixels); output stays in sprite coordinates")
+    parser.add_argument("--max-error", type=float, default=None,
+                        help="Use the fewest hull points (up to --max-points) that lose at most this "
+                             "percent of the non-transparent area compared to the full hull")
+    parser.add_argument("--output-dir", "-d",
+                        help="Batch mode: directory for the .convexshape files (default: next to each image)")
+    parser.add_argument("--manifest",
+                        help=f"Batch mode: manifest path (default: {MANIFEST_NAME} in the output "
+                             "directory, next to the atlas, or in the current directory)")
+    parser.add_argument("--workers", "-w", type=int, default=None,
+                        help="Batch mode: number of worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="Batch mode: regenerate all images, ignoring the manifest")
+    parser.add_argument("--fit", action="store_true",
+                        help="Emit a sphere or box instead of the hull when it fits within --fit-tolerance")
+    parser.add_argument("--fit-tolerance", type=float, default=5.0,
+                        help="Allowed coverage error for --fit, percent of the non-transparent area (default: 5)")
+    args = parser.parse_args()
+
+    if is_batch_input(args.image_path):
+        return run_batch(args)
+    return generate(args, args.image_path, args.output)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -10,11 +10,10 @@ level geometry.
 
 Algorithm:
     1. Load the image and build a binary alpha mask.
-    2. Extract directed boundary edges between opaque and transparent regions.
-    3. Chain edges into closed contour loops (handles multiple disconnected
-       components and holes).
-    4. Simplify each contour with Ramer-Douglas-Peucker.
-    5. For every edge of the simplified polygon, emit a thin TYPE_BOX whose
+    2. Trace the boundary between opaque and transparent regions into closed
+       contour loops (handles multiple disconnected components and holes).
+    3. Simplify each contour with Ramer-Douglas-Peucker.
+    4. For every edge of the simplified polygon, emit a thin TYPE_BOX whose
        position is the edge midpoint (in image-centred, Y-up Defold coords)
        and whose rotation quaternion aligns the box along the edge.
 
@@ -25,9 +24,20 @@ Arguments:
     image_path                Path to a PNG or JPEG image file
     --output, -o              Output .collisionobject file path (default: stdout)
     --epsilon, -e             RDP simplification tolerance in pixels (default: 2.0)
+    --max-shapes N            Raise epsilon until at most N boxes are emitted
+    --max-error E             Largest allowed deviation from the outline in pixels
+                              (caps the --max-shapes search, or sets epsilon alone).
+                              Contours that simplify to fewer than 3 points are
+                              kept as triangles and may deviate by more.
     --thickness, -t           Half-thickness of each wall box in pixels (default: 2.0)
     --alpha-threshold, -a     Alpha threshold for "non-transparent" (0-255, default: 1)
     --force-png-py            Force using bundled png.py instead of PIL (PNG only)
+    --no-cache                Do not use the decoded alpha cache
+    --scale, --max-dim        Build the mask at reduced resolution (see image_loader)
+    --roi X,Y,W,H             Only use this region of the image
+    --chunk-size S            Split the boxes into S x S pixel chunks, one
+                              .collisionobject each (requires --output)
+    --chunk-container         "collection" (default) or "go": file placing the chunks
     --group, -g               Collision group (default: "default")
     --mask                    Collision mask group (repeatable, default: "default")
     --friction                Friction coefficient (default: 0.1)
@@ -35,10 +45,14 @@ Arguments:
 
 Output:
     Protobuf Text Format .collisionobject with COLLISION_OBJECT_TYPE_STATIC
-    and embedded TYPE_BOX shapes.
+    and embedded TYPE_BOX shapes.  With --chunk-size, <output>_<col>_<row>.collisionobject
+    per grid cell (columns/rows counted from the image's top-left), each with
+    box positions relative to the cell centre, plus <output>.collection (or
+    .go) placing every chunk at its cell centre.
 
 Environment:
     FORCE_PNG_PY=1            Same as --force-png-py
+    DEFOLD_MASK_CACHE=0       Same as --no-cache
 
 Exit code 0 on success, 1 on error.
 """
@@ -52,113 +66,139 @@ from typing import TextIO
 # image_loader is in the same directory; adjust sys.path so it's importable
 # both when invoked directly and from the editor script.
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from image_loader import load_binary_mask
+from image_loader import Mask, load_mask, parse_roi, parse_scale
+from simplify import flat_coords, rdp_mark, segment_distance
 
 
 # ---------------------------------------------------------------------------
-# Contour extraction (directed boundary edges → closed loops)
+# Contour extraction (boundary tracing → closed loops)
 # ---------------------------------------------------------------------------
 
-def extract_contours(
-    mask: list[list[bool]], width: int, height: int
-) -> list[list[tuple[float, float]]]:
+# Walking directions out of a grid vertex, in the order ties are broken
+_UP, _DOWN, _LEFT, _RIGHT = 0, 1, 2, 3
+_STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+def _exit_table() -> tuple[tuple[int, ...], ...]:
+    """Outgoing boundary directions for each 2x2 neighbourhood of a grid vertex.
+
+    The index packs the four pixels around the vertex as
+    TL | TR << 1 | BL << 2 | BR << 3.  Boundaries are walked with the opaque
+    side on the right in pixel space (Y-down), which becomes CCW in Defold's
+    Y-up space.  Only the two saddle cases have more than one exit.
+    """
+    table = []
+    for code in range(16):
+        tl, tr, bl, br = code & 1, code >> 1 & 1, code >> 2 & 1, code >> 3 & 1
+        exits = []
+        if tr and not tl:
+            exits.append(_UP)
+        if bl and not br:
+            exits.append(_DOWN)
+        if tl and not bl:
+            exits.append(_LEFT)
+        if br and not tr:
+            exits.append(_RIGHT)
+        table.append(tuple(exits))
+    return tuple(table)
+
+
+_EXITS = _exit_table()
+
+
+def extract_contours(mask: Mask) -> list[list[tuple[float, float]]]:
     """Extract ordered contour loops from the binary mask.
 
-    Uses directed boundary edges on the pixel grid.  Each edge runs between
-    two grid vertices (integer coordinates 0..W, 0..H).  Edges are chained
-    into closed loops by following start→end links.
+    Follows the boundary between opaque and transparent pixels along the
+    pixel grid (a marching-squares walk).  Grid vertices have integer
+    coordinates 0..W, 0..H; pixels outside the mask count as transparent, so
+    shapes touching the image edges still produce closed loops.
+
+    Loops are started from the vertical boundary edges in (column, row)
+    order, which are read off the row spans, and at a saddle vertex the
+    first unused exit in up / down / left / right order is taken.  Only the
+    visited vertical edges and saddle exits are remembered, so memory is
+    proportional to the boundary length rather than the image size.
 
     Returns a list of contours, each a list of (x, y) grid-vertex coords
     forming a closed polygon (first point == last point).
     """
 
-    def is_opaque(px: int, py: int) -> bool:
-        if 0 <= px < width and 0 <= py < height:
-            return mask[py][px]
-        return False
-
-    # Pad the mask with a 1-pixel transparent border so shapes touching
-    # image edges always produce closed contour loops.
-    pad_w = width + 2
-    pad_h = height + 2
-    padded: list[list[bool]] = [[False] * pad_w for _ in range(pad_h)]
-    for py in range(height):
-        for px in range(width):
-            padded[py + 1][px + 1] = mask[py][px]
-
-    def is_opaque_padded(px: int, py: int) -> bool:
-        if 0 <= px < pad_w and 0 <= py < pad_h:
-            return padded[py][px]
-        return False
-
-    # Collect directed edges as a list, then index by start vertex.
-    edge_list: list[tuple[tuple[int, int], tuple[int, int]]] = []
-
-    # Direction convention: walk CW around opaque region in pixel space
-    # (Y-down), which becomes CCW in Defold's Y-up space.
-    #
-    # Vertical edge at column c between rows r and r+1:
-    #   opaque on left  (c-1, r) → edge goes DOWN: (c,r)→(c,r+1)
-    #   opaque on right (c,   r) → edge goes UP:   (c,r+1)→(c,r)
-    for c in range(pad_w + 1):
-        for r in range(pad_h):
-            left_opaque = is_opaque_padded(c - 1, r)
-            right_opaque = is_opaque_padded(c, r)
-            if left_opaque == right_opaque:
-                continue
-            if left_opaque:
-                edge_list.append(((c, r), (c, r + 1)))
-            else:
-                edge_list.append(((c, r + 1), (c, r)))
-
-    # Horizontal edge at row r between columns c and c+1:
-    #   opaque below (c, r)   → edge goes RIGHT: (c,r)→(c+1,r)
-    #   opaque above (c, r-1) → edge goes LEFT:  (c+1,r)→(c,r)
-    for r in range(pad_h + 1):
-        for c in range(pad_w):
-            top_opaque = is_opaque_padded(c, r - 1)
-            bot_opaque = is_opaque_padded(c, r)
-            if top_opaque == bot_opaque:
-                continue
-            if bot_opaque:
-                edge_list.append(((c, r), (c + 1, r)))
-            else:
-                edge_list.append(((c + 1, r), (c, r)))
+    width = mask.width
+    height = mask.height
+    data = mask.data
+    stride = width + 1
+
+    def code_at(x: int, y: int) -> int:
+        """Neighbourhood code of grid vertex (x, y), see _exit_table()."""
+        code = 0
+        if y > 0:
+            row = (y - 1) * width
+            if x > 0 and data[row + x - 1]:
+                code = 1
+            if x < width and data[row + x]:
+                code |= 2
+        if y < height:
+            row = y * width
+            if x > 0 and data[row + x - 1]:
+                code |= 4
+            if x < width and data[row + x]:
+                code |= 8
+        return code
+
+    # Vertical boundary edges sit at the span ends of each row
+    starts: list[tuple[int, int]] = []
+    for r in range(height):
+        for x_start, x_end in mask.row_spans(r):
+            starts.append((x_start, r))
+            starts.append((x_end, r))
+    starts.sort()
+
+    # Vertical edge (x, r) → (x, r + 1) has id r * (W + 1) + x
+    used_vertical: set[int] = set()
+    used_saddle: set[tuple[int, int, int]] = set()
 
-    # Build adjacency: start_vertex → list of edge indices
-    adj: dict[tuple[int, int], list[int]] = {}
-    for idx, (s, _e) in enumerate(edge_list):
-        adj.setdefault(s, []).append(idx)
-
-    used = [False] * len(edge_list)
-
-    # Chain edges into closed loops
     contours: list[list[tuple[float, float]]] = []
-    for start_idx in range(len(edge_list)):
-        if used[start_idx]:
+    for x, r in starts:
+        edge_id = r * stride + x
+        if edge_id in used_vertical:
             continue
-        used[start_idx] = True
-        start_vertex = edge_list[start_idx][0]
-        loop: list[tuple[float, float]] = [start_vertex, edge_list[start_idx][1]]
-        current = edge_list[start_idx][1]
-
-        while current != start_vertex:
-            found = False
-            if current in adj:
-                for ei in adj[current]:
-                    if not used[ei]:
-                        used[ei] = True
-                        nxt = edge_list[ei][1]
-                        loop.append(nxt)
-                        current = nxt
-                        found = True
+        used_vertical.add(edge_id)
+        # Opaque on the right → the edge goes up, otherwise down
+        if x < width and data[r * width + x]:
+            start = (x, r + 1)
+            cx, cy = x, r
+        else:
+            start = (x, r)
+            cx, cy = x, r + 1
+        loop: list[tuple[int, int]] = [start, (cx, cy)]
+
+        while (cx, cy) != start:
+            exits = _EXITS[code_at(cx, cy)]
+            direction = exits[0]
+            if len(exits) > 1:
+                for d in exits:
+                    if d == _UP:
+                        taken = (cy - 1) * stride + cx in used_vertical
+                    elif d == _DOWN:
+                        taken = cy * stride + cx in used_vertical
+                    else:
+                        taken = (cx, cy, d) in used_saddle
+                    if not taken:
+                        direction = d
                         break
-            if not found:
-                break
-
-        if current == start_vertex and len(loop) >= 4:
-            # Shift coordinates back by the padding offset (1, 1)
-            contours.append([(x - 1.0, y - 1.0) for x, y in loop])
+                if direction in (_LEFT, _RIGHT):
+                    used_saddle.add((cx, cy, direction))
+            if direction == _UP:
+                used_vertical.add((cy - 1) * stride + cx)
+            elif direction == _DOWN:
+                used_vertical.add(cy * stride + cx)
+            dx, dy = _STEPS[direction]
+            cx += dx
+            cy += dy
+            loop.append((cx, cy))
+
+        contours.append([(float(px), float(py)) for px, py in loop])
 
     return contours
 
@@ -167,45 +207,32 @@ def extract_contours(
 # Ramer-Douglas-Peucker simplification (for closed polygons)
 # ---------------------------------------------------------------------------
 
-def _perpendicular_distance(
-    px: float, py: float, ax: float, ay: float, bx: float, by: float
-) -> float:
-    """Perpendicular distance from point P to line segment A-B."""
-    dx = bx - ax
-    dy = by - ay
-    length_sq = dx * dx + dy * dy
-    if length_sq == 0.0:
-        return math.hypot(px - ax, py - ay)
-    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
-    proj_x = ax + t * dx
-    proj_y = ay + t * dy
-    return math.hypot(px - proj_x, py - proj_y)
-
-
-def _rdp_reduce(
-    points: list[tuple[float, float]], epsilon: float
-) -> list[tuple[float, float]]:
-    """Ramer-Douglas-Peucker on an open polyline."""
-    if len(points) <= 2:
-        return points
-
-    ax, ay = points[0]
-    bx, by = points[-1]
-
-    max_dist = 0.0
-    max_idx = 0
-    for i in range(1, len(points) - 1):
-        d = _perpendicular_distance(points[i][0], points[i][1], ax, ay, bx, by)
-        if d > max_dist:
-            max_dist = d
-            max_idx = i
-
-    if max_dist > epsilon:
-        left = _rdp_reduce(points[: max_idx + 1], epsilon)
-        right = _rdp_reduce(points[max_idx:], epsilon)
-        return left[:-1] + right
-    else:
-        return [points[0], points[-1]]
+def simplify_contour_indices(
+    contour: list[tuple[float, float]], epsilon: float
+) -> list[int]:
+    """Indices of the contour points kept by simplify_contour()."""
+    # Remove closing duplicate for processing
+    pts = contour[:-1]
+    n = len(pts)
+    if n < 3:
+        return list(range(n))
+
+    # For a closed polygon, we split at the point farthest from the
+    # line between its neighbours to avoid arbitrary split artefacts.
+    # Simple approach: split the ring into two halves and RDP each.
+    # Point n is the closing copy of point 0.
+    half = n // 2
+    coords = flat_coords(pts)
+    coords.extend(coords[:2])
+    keep = bytearray(n + 1)
+    rdp_mark(coords, keep, 0, half, epsilon)
+    rdp_mark(coords, keep, half, n, epsilon)
+
+    indices = [i for i in range(n) if keep[i]]
+    if len(indices) < 3:
+        # Too small for epsilon: keep a triangle, which may deviate by more
+        indices = [0, 1, 2]
+    return indices
 
 
 def simplify_contour(
@@ -216,31 +243,76 @@ def simplify_contour(
     The input contour has first == last point.  Returns a simplified closed
     polygon (first == last) with at least 3 unique vertices.
     """
-    # Remove closing duplicate for processing
-    pts = contour[:-1]
-    if len(pts) < 3:
+    if len(contour) < 4:
         return contour
+    merged = [contour[i] for i in simplify_contour_indices(contour, epsilon)]
+    merged.append(merged[0])
+    return merged
 
-    # For a closed polygon, we split at the point farthest from the
-    # line between its neighbours to avoid arbitrary split artefacts.
-    # Simple approach: split the ring into two halves and RDP each.
-    n = len(pts)
-    half = n // 2
-    first_half = pts[: half + 1]
-    second_half = pts[half:] + [pts[0]]
 
-    simplified_first = _rdp_reduce(first_half, epsilon)
-    simplified_second = _rdp_reduce(second_half, epsilon)
+def contour_deviation(contour: list[tuple[float, float]], indices: list[int]) -> float:
+    """Largest distance of a contour point from the simplified polygon edge replacing it."""
+    n = len(contour) - 1
+    deviation = 0.0
+    for k, start in enumerate(indices):
+        end = indices[k + 1] if k + 1 < len(indices) else indices[0] + n
+        ax, ay = contour[start]
+        bx, by = contour[end % n]
+        dx = bx - ax
+        dy = by - ay
+        length_sq = dx * dx + dy * dy
+        for i in range(start + 1, end):
+            px, py = contour[i % n]
+            deviation = max(deviation, segment_distance(px, py, ax, ay, dx, dy, length_sq))
+    return deviation
+
+
+def count_boxes(contours: list[list[tuple[float, float]]]) -> int:
+    """Number of boxes write_collisionobject() emits for closed contours."""
+    return sum(
+        1
+        for contour in contours
+        for (x1, y1), (x2, y2) in zip(contour, contour[1:])
+        if math.hypot(x2 - x1, y2 - y1) >= 1e-6
+    )
 
-    # Merge (remove duplicate junction points)
-    merged = simplified_first[:-1] + simplified_second[:-1]
 
-    # Close the polygon
-    if len(merged) < 3:
-        merged = pts[:3]
-    merged.append(merged[0])
+def search_epsilon(
+    contours: list[list[tuple[float, float]]],
+    max_shapes: int,
+    low: float,
+    high: float,
+    precision: float = 0.01,
+) -> tuple[float, list[list[tuple[float, float]]], int]:
+    """Smallest epsilon in [low, high] whose simplification needs at most max_shapes boxes.
+
+    RDP keeps a point when every split above it in the recursion is farther
+    than epsilon, so the box count never grows with epsilon and a binary
+    search applies.  The same traced contours are simplified at every step.
+    Returns (epsilon, simplified contours, iterations); when even high is
+    over budget, high is returned.
+    """
 
-    return merged
+    def simplify_all(epsilon: float) -> list[list[tuple[float, float]]]:
+        return [simplify_contour(c, epsilon) for c in contours]
+
+    best = simplify_all(low)
+    iterations = 1
+    if count_boxes(best) <= max_shapes:
+        return low, best, iterations
+    best = simplify_all(high)
+    iterations += 1
+    if count_boxes(best) > max_shapes:
+        return high, best, iterations
+    while high - low > precision:
+        mid = (low + high) / 2.0
+        candidate = simplify_all(mid)
+        iterations += 1
+        if count_boxes(candidate) <= max_shapes:
+            high, best = mid, candidate
+        else:
+            low = mid
+    return high, best, iterations
 
 
 # ---------------------------------------------------------------------------
@@ -266,24 +338,21 @@ def angle_to_quat_z(angle: float) -> tuple[float, float]:
     return (math.sin(half), math.cos(half))
 
 
-def write_collisionobject(
+Box = tuple[float, float, float, float, float, float]
+
+
+def contour_boxes(
     contours: list[list[tuple[float, float]]],
     thickness: float,
     img_width: int,
     img_height: int,
-    group: str,
-    masks: list[str],
-    friction: float,
-    restitution: float,
-    out: TextIO,
-) -> int:
-    """Write a .collisionobject with rotated TYPE_BOX shapes along contour edges.
+) -> list[Box]:
+    """Rotated wall boxes along contour edges: (pos_x, pos_y, qz, qw, ext_x, ext_y).
 
-    Returns the number of boxes written.
+    Positions are in image-centred, Y-up Defold coordinates.
     """
     cx = img_width / 2.0
     cy = img_height / 2.0
-    ext_z = 10.0
 
     # Collect all boxes: (pos_x, pos_y, qz, qw, ext_x, ext_y)
     boxes: list[tuple[float, float, float, float, float, float]] = []
@@ -323,6 +392,23 @@ def write_collisionobject(
 
             boxes.append((pos_x, pos_y, qz, qw, ext_x, ext_y))
 
+    return boxes
+
+
+def write_boxes(
+    boxes: list[Box],
+    group: str,
+    masks: list[str],
+    friction: float,
+    restitution: float,
+    out: TextIO,
+) -> int:
+    """Write a static .collisionobject with the given TYPE_BOX shapes.
+
+    Returns the number of boxes written.
+    """
+    ext_z = 10.0
+
     # Write header
     out.write("type: COLLISION_OBJECT_TYPE_STATIC\n")
     out.write("mass: 0.0\n")
@@ -367,6 +453,144 @@ def write_collisionobject(
     return len(boxes)
 
 
+def write_collisionobject(
+    contours: list[list[tuple[float, float]]],
+    thickness: float,
+    img_width: int,
+    img_height: int,
+    group: str,
+    masks: list[str],
+    friction: float,
+    restitution: float,
+    out: TextIO,
+) -> int:
+    """Write a .collisionobject with rotated TYPE_BOX shapes along contour edges.
+
+    Returns the number of boxes written.
+    """
+    boxes = contour_boxes(contours, thickness, img_width, img_height)
+    return write_boxes(boxes, group, masks, friction, restitution, out)
+
+
+# ---------------------------------------------------------------------------
+# Chunked output (--chunk-size)
+# ---------------------------------------------------------------------------
+
+def chunk_boxes(
+    boxes: list[Box], chunk_size: float, img_width: int, img_height: int
+) -> dict[tuple[int, int], tuple[float, float, list[Box]]]:
+    """Partition boxes into a grid of chunk_size x chunk_size pixel cells.
+
+    Cells are numbered (column, row) from the image's top-left corner and a
+    box belongs to the cell holding its centre.  Returns
+    {(column, row): (offset_x, offset_y, boxes)}, where the offset is the
+    cell centre in Defold coordinates and box positions are relative to it.
+    """
+    cx = img_width / 2.0
+    cy = img_height / 2.0
+    columns = max(1, math.ceil(img_width / chunk_size))
+    rows = max(1, math.ceil(img_height / chunk_size))
+    chunks: dict[tuple[int, int], tuple[float, float, list[Box]]] = {}
+    for box in boxes:
+        pos_x, pos_y, qz, qw, ext_x, ext_y = box
+        column = min(max(int(math.floor((pos_x + cx) / chunk_size)), 0), columns - 1)
+        row = min(max(int(math.floor((cy - pos_y) / chunk_size)), 0), rows - 1)
+        if (column, row) not in chunks:
+            offset_x = (column + 0.5) * chunk_size - cx
+            offset_y = cy - (row + 0.5) * chunk_size
+            chunks[(column, row)] = (offset_x, offset_y, [])
+        offset_x, offset_y, chunk = chunks[(column, row)]
+        chunk.append((pos_x - offset_x, pos_y - offset_y, qz, qw, ext_x, ext_y))
+    return dict(sorted(chunks.items(), key=lambda item: (item[0][1], item[0][0])))
+
+
+def resource_path(path: str) -> str:
+    """Defold resource path ("/main/x.ext") of a file, relative to the game.project directory."""
+    path = os.path.abspath(path)
+    current = os.path.dirname(path)
+    while not os.path.isfile(os.path.join(current, "game.project")):
+        parent = os.path.dirname(current)
+        if parent == current:
+            current = os.getcwd()
+            break
+        current = parent
+    return "/" + os.path.relpath(path, current).replace(os.sep, "/")
+
+
+def _write_position(out: TextIO, x: float, y: float, indent: str) -> None:
+    """Write a position block, omitting zero components (and the block if all are zero)."""
+    if x == 0.0 and y == 0.0:
+        return
+    out.write(f"{indent}position {{\n")
+    if x != 0.0:
+        out.write(f"{indent}  x: {format_float(x)}\n")
+    if y != 0.0:
+        out.write(f"{indent}  y: {format_float(y)}\n")
+    out.write(f"{indent}}}\n")
+
+
+def write_chunk_collection(name: str, chunks: list[tuple[str, str, float, float]], out: TextIO) -> None:
+    """Write a .collection with one game object per chunk: (id, component path, x, y)."""
+    out.write(f'name: "{name}"\n')
+    out.write("scale_along_z: 0\n")
+    for chunk_id, component, x, y in chunks:
+        out.write("embedded_instances {\n")
+        out.write(f'  id: "{chunk_id}"\n')
+        out.write('  data: "components {\\n"\n')
+        out.write('  "  id: \\"collisionobject\\"\\n"\n')
+        out.write(f'  "  component: \\"{component}\\"\\n"\n')
+        out.write('  "}\\n"\n')
+        out.write('  ""\n')
+        _write_position(out, x, y, "  ")
+        out.write("}\n")
+
+
+def write_chunk_gameobject(chunks: list[tuple[str, str, float, float]], out: TextIO) -> None:
+    """Write a .go with one collision object component per chunk: (id, component path, x, y)."""
+    for chunk_id, component, x, y in chunks:
+        out.write("components {\n")
+        out.write(f'  id: "{chunk_id}"\n')
+        out.write(f'  component: "{component}"\n')
+        _write_position(out, x, y, "  ")
+        out.write("}\n")
+
+
+def write_chunked_output(
+    args: argparse.Namespace,
+    contours: list[list[tuple[float, float]]],
+    width: int,
+    height: int,
+    masks: list[str],
+) -> int:
+    """Write one .collisionobject per chunk plus the .collection / .go placing them."""
+    boxes = contour_boxes(contours, args.thickness, width, height)
+    chunks = chunk_boxes(boxes, args.chunk_size, width, height)
+    base, _ext = os.path.splitext(args.output)
+    name = os.path.basename(base)
+
+    placed: list[tuple[str, str, float, float]] = []
+    for (column, row), (offset_x, offset_y, chunk) in chunks.items():
+        path = f"{base}_{column}_{row}.collisionobject"
+        with open(path, "w", newline="\n") as f:
+            write_boxes(chunk, args.group, masks, args.friction, args.restitution, f)
+        placed.append((f"chunk_{column}_{row}", resource_path(path), offset_x, offset_y))
+        print(f"Written: {path} ({len(chunk)} boxes)", file=sys.stderr)
+
+    container = f"{base}.{args.chunk_container}"
+    with open(container, "w", newline="\n") as f:
+        if args.chunk_container == "collection":
+            write_chunk_collection(name, placed, f)
+        else:
+            write_chunk_gameobject(placed, f)
+    print(
+        f"Box shapes: {len(boxes)} in {len(chunks)} chunk(s) of {format_float(args.chunk_size)} px "
+        f"(max {max((len(c) for _x, _y, c in chunks.values()), default=0)} per chunk)",
+        file=sys.stderr,
+    )
+    print(f"Written: {container}", file=sys.stderr)
+    return 0
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -384,12 +608,31 @@ def main() -> int:
                         help="Output .collisionobject file path (default: stdout)")
     parser.add_argument("--epsilon", "-e", type=float, default=2.0,
                         help="RDP simplification tolerance in pixels (default: 2.0)")
+    parser.add_argument("--max-shapes", type=int, default=None,
+                        help="Raise epsilon (binary search) until at most this many boxes are emitted")
+    parser.add_argument("--max-error", type=float, default=None,
+                        help="Largest allowed deviation from the traced outline in pixels; "
+                             "caps the --max-shapes search, or sets epsilon on its own")
     parser.add_argument("--thickness", "-t", type=float, default=2.0,
                         help="Half-thickness of wall boxes in pixels (default: 2.0)")
     parser.add_argument("--alpha-threshold", "-a", type=int, default=1,
                         help="Alpha threshold for non-transparent pixels (0-255, default: 1)")
     parser.add_argument("--force-png-py", action="store_true",
                         help="Force using bundled png.py instead of PIL (PNG only)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not use the decoded alpha cache (same as DEFOLD_MASK_CACHE=0)")
+    parser.add_argument("--scale", type=parse_scale, default=1.0,
+                        help="Build the mask at reduced resolution, 0 < S <= 1, e.g. 0.25 = 4x4 pixel cells; "
+                             "1/S is rounded half up (default: 1)")
+    parser.add_argument("--max-dim", type=int, default=None,
+                        help="Reduce resolution so the longest mask side is at most this many cells")
+    parser.add_argument("--roi", type=parse_roi, default=None, metavar="X,Y,W,H",
+                        help="Only use this region of the image (pixels); output stays in sprite coordinates")
+    parser.add_argument("--chunk-size", type=float, default=None,
+                        help="Split the boxes into a grid of chunks this many pixels wide, "
+                             "one .collisionobject per chunk (requires --output)")
+    parser.add_argument("--chunk-container", choices=("collection", "go"), default="collection",
+                        help="File placing the chunks at their offsets (default: collection)")
     parser.add_argument("--group", "-g", default="default",
                         help='Collision group (default: "default")')
     parser.add_argument("--mask", action="append", default=None,
@@ -401,42 +644,91 @@ def main() -> int:
     args = parser.parse_args()
 
     masks = args.mask if args.mask else ["default"]
+    if args.chunk_size is not None and (args.chunk_size <= 0 or not args.output):
+        print("ERROR: --chunk-size needs a positive size and --output", file=sys.stderr)
+        return 1
 
     # Load image
     try:
-        mask, width, height = load_binary_mask(
+        mask = load_mask(
             args.image_path, args.alpha_threshold,
             force_png_py=args.force_png_py,
+            cache=False if args.no_cache else None,
+            scale=args.scale, max_dim=args.max_dim, roi=args.roi,
         )
     except Exception as e:
         print(f"ERROR: Failed to read image: {e}", file=sys.stderr)
         return 1
 
+    frame = mask.frame
+    width, height = frame.source_width, frame.source_height
     print(f"Image: {args.image_path} ({width}x{height})", file=sys.stderr)
+    if not frame.is_identity():
+        print(
+            f"Mask: {mask.width}x{mask.height} cells of {frame.scale}x{frame.scale} px "
+            f"(region {frame.x},{frame.y} {frame.width}x{frame.height})",
+            file=sys.stderr,
+        )
 
     # Extract contours
-    contours = extract_contours(mask, width, height)
+    contours = extract_contours(mask)
     if not contours:
         print("ERROR: No contours found in image", file=sys.stderr)
         return 1
+    if not frame.is_identity():
+        # Back to source pixel space so epsilon and thickness stay in pixels
+        contours = [[frame.to_source(x, y) for x, y in contour] for contour in contours]
+        if args.epsilon < frame.scale:
+            print(
+                f"NOTE: --epsilon {args.epsilon} is below the {frame.scale} px cell size; "
+                "cell staircase steps will be kept as edges",
+                file=sys.stderr,
+            )
 
     total_verts = sum(len(c) - 1 for c in contours)
     print(f"Contours: {len(contours)} loops, {total_verts} vertices total", file=sys.stderr)
 
     # Simplify contours
-    simplified: list[list[tuple[float, float]]] = []
-    for contour in contours:
-        s = simplify_contour(contour, args.epsilon)
-        simplified.append(s)
+    epsilon = args.epsilon
+    if args.max_shapes is not None:
+        high = args.max_error if args.max_error is not None else math.hypot(width, height)
+        low = min(epsilon, high)
+        epsilon, simplified, iterations = search_epsilon(contours, args.max_shapes, low, high)
+        shapes = count_boxes(simplified)
+        print(f"Epsilon search: {iterations} iterations, epsilon={epsilon:.3f}", file=sys.stderr)
+        if shapes > args.max_shapes:
+            limit = "--max-error" if args.max_error is not None else "the image size"
+            print(
+                f"NOTE: {shapes} boxes exceed --max-shapes {args.max_shapes} at the epsilon allowed by {limit}",
+                file=sys.stderr,
+            )
+    else:
+        if args.max_error is not None:
+            epsilon = args.max_error
+        simplified = [simplify_contour(contour, epsilon) for contour in contours]
 
     total_simplified = sum(len(c) - 1 for c in simplified)
     print(
         f"Simplified: {total_simplified} vertices "
-        f"(epsilon={args.epsilon})",
+        f"(epsilon={round(epsilon, 3)})",
         file=sys.stderr,
     )
+    if args.max_shapes is not None or args.max_error is not None:
+        deviation = max(
+            contour_deviation(c, simplify_contour_indices(c, epsilon)) for c in contours
+        )
+        print(f"Max deviation: {deviation:.3f} px", file=sys.stderr)
+        if args.max_error is not None and deviation > args.max_error:
+            print(
+                f"NOTE: max deviation {deviation:.3f} px exceeds --max-error {args.max_error}; "
+                "contours that simplify to fewer than 3 points are kept as triangles "
+                "regardless of epsilon",
+                file=sys.stderr,
+            )
 
     # Write output
+    if args.chunk_size is not None:
+        return write_chunked_output(args, simplified, width, height, masks)
     if args.output:
         with open(args.output, "w", newline="\n") as f:
             n = write_collisionobject(
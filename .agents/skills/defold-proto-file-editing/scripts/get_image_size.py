@@ -5,6 +5,8 @@ No external dependencies — uses only Python stdlib (struct).
 Usage:
     python get_image_size.py <image_path> [<image_path> ...]
 
+An image path may point inside a zip archive: "lib.zip!/images/hero.png".
+
 Output (per image):
     <path> <width> <height>
 
@@ -13,11 +15,30 @@ Exit code 0 on success, 1 if any file fails.
 
 import struct
 import sys
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
 
 
+@contextmanager
+def open_image(path: str):
+    """Open a plain file or a zip member ("archive.zip!/member") for binary reading."""
+    archive, sep, member = path.partition("!/")
+    if not sep or not archive.lower().endswith(".zip"):
+        with open(path, "rb") as f:
+            yield f
+        return
+    with zipfile.ZipFile(archive) as zf:
+        try:
+            f = zf.open(member)
+        except KeyError:
+            raise FileNotFoundError(f"No member {member!r} in {archive}") from None
+        with f:
+            yield f
+
+
 def get_png_size(path: str) -> tuple[int, int] | None:
-    with open(path, "rb") as f:
+    with open_image(path) as f:
         sig = f.read(8)
         if sig[:4] != b"\x89PNG":
             return None
@@ -28,7 +49,7 @@ def get_png_size(path: str) -> tuple[int, int] | None:
 
 
 def get_jpeg_size(path: str) -> tuple[int, int] | None:
-    with open(path, "rb") as f:
+    with open_image(path) as f:
         soi = f.read(2)
         if soi != b"\xff\xd8":
             return None
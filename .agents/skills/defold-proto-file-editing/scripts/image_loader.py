@@ -2,21 +2,57 @@
 
 """Unified image loading with PIL/Pillow and pure-Python png.py fallback.
 
-Provides two functions used by gen_convexshape.py and gen_silhouette_chain.py:
+Provides the Mask type and the loaders used by gen_convexshape.py and
+gen_silhouette_chain.py:
 
+- load_mask()        — returns a compact Mask (one byte per pixel)
+- load_spans()       — returns run-length encoded Spans (opaque runs per row)
+- load_alpha_plane() — returns the raw alpha plane (cached on disk)
+- load_masks()       — loads many images in parallel, yielding as they finish
 - load_alpha_mask()  — returns list of non-transparent pixel coords + dimensions
 - load_binary_mask() — returns 2D boolean mask + dimensions
 
+load_alpha_mask() and load_binary_mask() are adapters over load_mask() kept
+for callers that expect the old return shapes.
+
 Backend selection order:
 1. PIL/Pillow (supports PNG, JPEG, and other formats).
 2. Bundled png.py (PNG only — raises an error for non-PNG files).
 
+With PIL the alpha channel is extracted and thresholded in C (getchannel()/
+tobytes(), then bytes.translate()); NumPy, when installed, is used to expand
+the result.
+
+PNG files without alpha/tRNS and JPEG files are recognized from their header
+alone and yield a full mask without decoding pixel data (no backend needed).
+
+Paths of the form "archive.zip!/path/inside.png" read the image straight
+from a zip member (e.g. a library zip from .deps) without extracting it.
+
 Set the environment variable FORCE_PNG_PY=1 or pass force_png_py=True
 to bypass PIL and use only the bundled png.py reader.
+
+Decoded alpha planes are cached zlib-compressed in
+$XDG_CACHE_HOME/defold-image-loader (default ~/.cache/defold-image-loader),
+keyed by file content hash and backend.  The mask at any threshold is derived
+from the cached plane without decoding.  Environment variables:
+DEFOLD_MASK_CACHE=0 disables the cache, DEFOLD_MASK_CACHE_DIR overrides its
+location, DEFOLD_MASK_CACHE_MAX_MB sets the size cap (default 256; least
+recently used entries are evicted first).
 """
 
+import argparse
+import hashlib
+import io
 import os
+import struct
 import sys
+import tempfile
+import zipfile
+import zlib
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from pathlib import Path
 
 
@@ -25,6 +61,39 @@ def _is_png(path: str) -> bool:
     return Path(path).suffix.lower() == ".png"
 
 
+# Separator between an archive and a member: "lib.zip!/images/hero.png"
+ARCHIVE_SEPARATOR = "!/"
+
+
+def split_archive_path(path: str) -> tuple[str, str] | None:
+    """Split "archive.zip!/member" into (archive, member); None for plain paths."""
+    archive, sep, member = str(path).partition(ARCHIVE_SEPARATOR)
+    if not sep or not archive.lower().endswith(".zip") or not member:
+        return None
+    return archive, member
+
+
+@contextmanager
+def open_image(path: str):
+    """Open an image for binary reading: a plain file or a zip member ("a.zip!/x.png").
+
+    Zip members are streamed from the archive (seekable, nothing extracted).
+    """
+    parts = split_archive_path(path)
+    if parts is None:
+        with open(path, "rb") as f:
+            yield f
+        return
+    archive, member = parts
+    with zipfile.ZipFile(archive) as zf:
+        try:
+            f = zf.open(member)
+        except KeyError:
+            raise FileNotFoundError(f"No member {member!r} in {archive}") from None
+        with f:
+            yield f
+
+
 def _try_import_pil(force_png_py: bool) -> type | None:
     """Try to import PIL.Image, return the class or None."""
     if force_png_py:
@@ -36,78 +105,394 @@ def _try_import_pil(force_png_py: bool) -> type | None:
         return None
 
 
+def _try_import_numpy():
+    """Try to import NumPy, return the module or None."""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
 # ---------------------------------------------------------------------------
-# PIL backend
+# Mask and Spans types
 # ---------------------------------------------------------------------------
 
-def _load_alpha_mask_pil(
-    path: str, threshold: int
-) -> tuple[list[tuple[int, int]], int, int]:
-    """Load image via PIL and return non-transparent pixel coordinates."""
-    from PIL import Image
+def _find_spans(data: bytes | bytearray, start: int, end: int) -> list[tuple[int, int]]:
+    """Opaque runs of data[start:end] (0/1 bytes) as (x_start, x_end) relative to start."""
+    spans: list[tuple[int, int]] = []
+    x = data.find(1, start, end)
+    while x != -1:
+        x_end = data.find(0, x, end)
+        if x_end == -1:
+            x_end = end
+        spans.append((x - start, x_end - start))
+        x = data.find(1, x_end, end)
+    return spans
 
-    img = Image.open(path)
-    width, height = img.size
 
-    if img.mode == "RGBA":
-        pixels = img.load()
-        coords = []
-        for y in range(height):
-            for x in range(width):
-                if pixels[x, y][3] >= threshold:
-                    coords.append((x, y))
-    elif img.mode == "LA":
-        pixels = img.load()
-        coords = []
-        for y in range(height):
-            for x in range(width):
-                if pixels[x, y][1] >= threshold:
-                    coords.append((x, y))
-    elif img.mode == "P":
-        img_rgba = img.convert("RGBA")
-        pixels = img_rgba.load()
-        coords = []
-        for y in range(height):
-            for x in range(width):
-                if pixels[x, y][3] >= threshold:
-                    coords.append((x, y))
+def _threshold_table(threshold: int) -> bytes:
+    """bytes.translate() table mapping 8-bit alpha to 1 (>= threshold) or 0."""
+    return bytes(1 if a >= threshold else 0 for a in range(256))
+
+
+class Frame:
+    """Placement of a mask in the source image: ROI offset and downsampling factor.
+
+    A mask cell (x, y) covers source pixels ``self.x + x * scale`` ..
+    ``+ scale - 1`` (clipped to the region), so coordinates computed on a
+    cropped or reduced mask can be mapped back to the original sprite.
+    """
+
+    __slots__ = ("scale", "x", "y", "width", "height", "source_width", "source_height")
+
+    def __init__(self, scale: int, x: int, y: int, width: int, height: int,
+                 source_width: int, source_height: int) -> None:
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.source_width = source_width
+        self.source_height = source_height
+
+    @classmethod
+    def identity(cls, width: int, height: int) -> "Frame":
+        """Frame of a full-resolution, uncropped mask."""
+        return cls(1, 0, 0, width, height, width, height)
+
+    def is_identity(self) -> bool:
+        return self.scale == 1 and (self.x, self.y, self.width, self.height) == (
+            0, 0, self.source_width, self.source_height)
+
+    def to_source(self, x: float, y: float) -> tuple[float, float]:
+        """Map a grid-vertex coordinate of the mask to source pixel space."""
+        return (
+            min(self.x + x * self.scale, self.x + self.width),
+            min(self.y + y * self.scale, self.y + self.height),
+        )
+
+    def cell_pixels(self, x: int, y: int) -> tuple[int, int, int, int]:
+        """Source pixel index range (x0, y0, x1, y1), inclusive, covered by mask cell (x, y)."""
+        x0 = self.x + x * self.scale
+        y0 = self.y + y * self.scale
+        return (
+            x0, y0,
+            min(x0 + self.scale, self.x + self.width) - 1,
+            min(y0 + self.scale, self.y + self.height) - 1,
+        )
+
+
+class Mask:
+    """Binary image mask stored as one byte per pixel (1 = opaque, 0 = transparent).
+
+    Rows are stored top to bottom in a single bytearray.  ``mask[y]`` returns a
+    zero-copy memoryview of row ``y``, so ``mask[y][x]`` works like the old
+    list-of-lists masks.  Spans use an exclusive end: ``(x_start, x_end)``
+    covers pixels ``x_start .. x_end - 1``.
+    """
+
+    __slots__ = ("width", "height", "data", "frame")
+
+    def __init__(self, width: int, height: int, data: bytearray | None = None,
+                 frame: Frame | None = None) -> None:
+        self.width = width
+        self.height = height
+        self.data = data if data is not None else bytearray(width * height)
+        self.frame = frame if frame is not None else Frame.identity(width, height)
+        if len(self.data) != width * height:
+            raise ValueError(f"Mask data has {len(self.data)} bytes, expected {width * height}")
+
+    @classmethod
+    def full(cls, width: int, height: int, frame: Frame | None = None) -> "Mask":
+        """Return a mask with every pixel opaque."""
+        return cls(width, height, bytearray(b"\x01") * (width * height), frame)
+
+    @classmethod
+    def from_rows(cls, rows: list[list[bool]]) -> "Mask":
+        """Build a mask from a 2D boolean list (the load_binary_mask() shape)."""
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        data = bytearray()
+        for row in rows:
+            data.extend(bytes(map(bool, row)))
+        return cls(width, height, data)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        return self.row(y)
+
+    def row(self, y: int) -> memoryview:
+        """Zero-copy view of row y (values 0 / 1)."""
+        if not 0 <= y < self.height:
+            raise IndexError(f"Mask row {y} out of range")
+        return memoryview(self.data)[y * self.width:(y + 1) * self.width]
+
+    def is_opaque(self, x: int, y: int) -> bool:
+        """Opacity of pixel (x, y); pixels outside the mask are transparent."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.data[y * self.width + x] == 1
+        return False
+
+    def count(self) -> int:
+        """Number of opaque pixels."""
+        return self.data.count(1)
+
+    def row_spans(self, y: int) -> list[tuple[int, int]]:
+        """Opaque runs of row y as (x_start, x_end) pairs, x_end exclusive."""
+        start = y * self.width
+        return _find_spans(self.data, start, start + self.width)
+
+    def spans(self) -> "Spans":
+        """Run-length encoded copy of this mask."""
+        return Spans(self.width, self.height, [self.row_spans(y) for y in range(self.height)], self.frame)
+
+    def bbox(self) -> tuple[int, int, int, int] | None:
+        """Bounding box of opaque pixels as (x0, y0, x1, y1), x1/y1 exclusive; None if empty."""
+        x0 = self.width
+        x1 = 0
+        y0 = -1
+        y1 = -1
+        for y in range(self.height):
+            spans = self.row_spans(y)
+            if not spans:
+                continue
+            if y0 == -1:
+                y0 = y
+            y1 = y + 1
+            x0 = min(x0, spans[0][0])
+            x1 = max(x1, spans[-1][1])
+        if y0 == -1:
+            return None
+        return x0, y0, x1, y1
+
+    def to_coords(self) -> list[tuple[int, int]]:
+        """Opaque pixel coordinates in row-major order (the load_alpha_mask() shape)."""
+        np = _try_import_numpy()
+        if np is not None:
+            ys, xs = np.nonzero(np.frombuffer(self.data, dtype=np.uint8).reshape(self.height, self.width))
+            return list(zip(xs.tolist(), ys.tolist()))
+
+        coords: list[tuple[int, int]] = []
+        for y in range(self.height):
+            for x_start, x_end in self.row_spans(y):
+                coords.extend((x, y) for x in range(x_start, x_end))
+        return coords
+
+    def to_rows(self) -> list[list[bool]]:
+        """2D boolean mask, True = opaque (the load_binary_mask() shape)."""
+        np = _try_import_numpy()
+        if np is not None:
+            return np.frombuffer(self.data, dtype=np.uint8).reshape(self.height, self.width).astype(bool).tolist()
+        w = self.width
+        return [list(map(bool, self.data[y * w:(y + 1) * w])) for y in range(self.height)]
+
+
+class Spans:
+    """Run-length encoded mask: per-row lists of opaque (x_start, x_end) runs.
+
+    ``rows[y]`` is sorted by x; x_end is exclusive.  Most silhouettes have a
+    handful of runs per row, so algorithms that walk spans run in O(spans)
+    instead of O(pixels).
+    """
+
+    __slots__ = ("width", "height", "rows", "frame")
+
+    def __init__(self, width: int, height: int, rows: list[list[tuple[int, int]]],
+                 frame: Frame | None = None) -> None:
+        self.width = width
+        self.height = height
+        self.rows = rows
+        self.frame = frame if frame is not None else Frame.identity(width, height)
+
+    @classmethod
+    def full(cls, width: int, height: int, frame: Frame | None = None) -> "Spans":
+        """Return spans with every pixel opaque."""
+        return cls(width, height, [[(0, width)] if width else [] for _ in range(height)], frame)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> list[tuple[int, int]]:
+        return self.rows[y]
+
+    def count(self) -> int:
+        """Number of opaque pixels."""
+        return sum(x_end - x_start for row in self.rows for x_start, x_end in row)
+
+    def span_count(self) -> int:
+        """Total number of runs."""
+        return sum(len(row) for row in self.rows)
+
+    def bbox(self) -> tuple[int, int, int, int] | None:
+        """Bounding box of opaque pixels as (x0, y0, x1, y1), x1/y1 exclusive; None if empty."""
+        ys = [y for y, row in enumerate(self.rows) if row]
+        if not ys:
+            return None
+        x0 = min(self.rows[y][0][0] for y in ys)
+        x1 = max(self.rows[y][-1][1] for y in ys)
+        return x0, ys[0], x1, ys[-1] + 1
+
+    def to_mask(self) -> Mask:
+        """Expand to a Mask."""
+        mask = Mask(self.width, self.height, frame=self.frame)
+        data = mask.data
+        for y, row in enumerate(self.rows):
+            offset = y * self.width
+            for x_start, x_end in row:
+                data[offset + x_start:offset + x_end] = b"\x01" * (x_end - x_start)
+        return mask
+
+
+# ---------------------------------------------------------------------------
+# Header sniffing
+# ---------------------------------------------------------------------------
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG color types with an alpha channel: grayscale+alpha, RGBA
+_PNG_ALPHA_COLOR_TYPES = (4, 6)
+# JPEG start-of-frame markers (SOF0..SOF15 minus DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _sniff_png(f) -> tuple[int, int] | None:
+    """Return (width, height) if the PNG has neither an alpha channel nor tRNS."""
+    chunk = f.read(25)  # IHDR: length, type, 13 data bytes, CRC
+    if len(chunk) < 25 or chunk[4:8] != b"IHDR":
+        return None
+    width, height, _bitdepth, color_type = struct.unpack(">IIBB", chunk[8:18])
+    if color_type in _PNG_ALPHA_COLOR_TYPES:
+        return None
+    # tRNS must appear before the first IDAT chunk
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        length, chunk_type = struct.unpack(">I4s", header)
+        if chunk_type == b"tRNS":
+            return None
+        if chunk_type in (b"IDAT", b"IEND"):
+            return width, height
+        f.seek(length + 4, os.SEEK_CUR)
+
+
+def _sniff_jpeg(f) -> tuple[int, int] | None:
+    """Return (width, height) from the JPEG SOF segment (JPEG has no alpha)."""
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            return None
+        marker = f.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code == 0x01 or 0xD0 <= code <= 0xD8:  # standalone markers
+            continue
+        if code == 0xDA:  # start of scan without a frame header
+            return None
+        segment = f.read(2)
+        if len(segment) < 2:
+            return None
+        length = struct.unpack(">H", segment)[0]
+        if code in _JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return (width, height) if width and height else None
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _sniff_opaque_size(path: str) -> tuple[int, int] | None:
+    """Read only the image header; return (width, height) if the image cannot have transparency.
+
+    Recognizes PNG (IHDR color type without alpha and no tRNS chunk) and JPEG
+    (never has alpha; size from the SOF segment).  Returns None for anything
+    else, which then goes through a full decode.
+    """
+    try:
+        with open_image(path) as f:
+            magic = f.read(8)
+            if magic == _PNG_SIGNATURE:
+                return _sniff_png(f)
+            if magic[:2] == b"\xff\xd8":
+                f.seek(2)
+                return _sniff_jpeg(f)
+    except (OSError, struct.error, zipfile.BadZipFile):
+        pass
+    return None
+
+
+# ---------------------------------------------------------------------------
+# PIL backend
+# ---------------------------------------------------------------------------
+
+def _palette_alpha_pil(img) -> bytes | None:
+    """256-entry index → alpha table of a PIL "P" image, or None if the palette is opaque."""
+    transparency = img.info.get("transparency")
+    if img.palette is not None and img.palette.mode == "RGBA":
+        table = bytes(img.getpalette("RGBA")[3::4])
+    elif isinstance(transparency, int):
+        # A single fully transparent index (GIF, PNG tRNS with one entry)
+        table = bytes(0 if i == transparency else 255 for i in range(256))
+    elif isinstance(transparency, bytes):
+        table = transparency
     else:
-        # No alpha channel (RGB, L, etc.) — all pixels are opaque
-        coords = [(x, y) for y in range(height) for x in range(width)]
+        return None
+    return (table + b"\xff" * 256)[:256]
 
-    return coords, width, height
 
+def _load_alpha_pil(path: str) -> tuple[int, int, bytes | None]:
+    """Load image via PIL and return (width, height, 8-bit alpha plane).
 
-def _load_binary_mask_pil(
-    path: str, threshold: int
-) -> tuple[list[list[bool]], int, int]:
-    """Load image via PIL and return a 2D boolean mask."""
+    The alpha plane is None when the image has no alpha (every pixel is opaque).
+    """
     from PIL import Image
 
-    img = Image.open(path)
+    if split_archive_path(path):
+        # PIL seeks freely while decoding; give it an in-memory copy of the member
+        with open_image(path) as f:
+            img = Image.open(io.BytesIO(f.read()))
+    else:
+        img = Image.open(path)
     width, height = img.size
 
-    if img.mode != "RGBA":
-        img = img.convert("RGBA")
-    pixels = img.load()
-
-    mask: list[list[bool]] = []
-    for y in range(height):
-        row: list[bool] = []
-        for x in range(width):
-            row.append(pixels[x, y][3] >= threshold)
-        mask.append(row)
+    if img.mode in ("RGBA", "LA"):
+        alpha = img.getchannel("A")
+    elif img.mode in ("RGB", "L") and "transparency" not in img.info:
+        # No alpha channel — all pixels are opaque
+        return width, height, None
+    elif img.mode == "P":
+        # Map palette indices straight to alpha, no RGBA copy
+        table = _palette_alpha_pil(img)
+        if table is None:
+            return width, height, None
+        return width, height, img.tobytes().translate(table)
+    else:
+        alpha = img.convert("RGBA").getchannel("A")
 
-    return mask, width, height
+    return width, height, alpha.tobytes()
 
 
 # ---------------------------------------------------------------------------
 # png.py fallback backend
 # ---------------------------------------------------------------------------
 
-def _load_png_reader(path: str):
-    """Create a png.Reader and read the image as direct RGBA/LA/RGB/L data."""
-    # Import the bundled png.py from the same directory
+_png_module = None
+
+
+def _bundled_png():
+    """Import the bundled png.py from the same directory (once per process)."""
+    global _png_module
+    if _png_module is not None:
+        return _png_module
+
     script_dir = os.path.dirname(os.path.abspath(__file__))
     png_module_path = os.path.join(script_dir, "png.py")
     if not os.path.isfile(png_module_path):
@@ -117,57 +502,160 @@ def _load_png_reader(path: str):
     spec = importlib.util.spec_from_file_location("_bundled_png", png_module_path)
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)
+    _png_module = mod
+    return mod
 
-    reader = mod.Reader(filename=path)
-    width, height, rows, info = reader.asDirect()
-    # Materialize rows (they may be a generator)
-    rows = [list(row) for row in rows]
-    return width, height, rows, info
 
+def _load_alpha_png(path: str) -> tuple[int, int, int, bytes | None]:
+    """Load a PNG image via bundled png.py; return (width, height, bitdepth, alpha plane).
+
+    The alpha plane holds one byte per pixel (bitdepth 8) or one native-endian
+    unsigned short per pixel (bitdepth 16); it is None when the image has no
+    alpha (every pixel is opaque).  Decoded rows are consumed one at a time
+    from png.py's row generator; only the alpha plane is kept.
+    """
+    with open_image(path) as f:
+        reader = _bundled_png().Reader(file=f)
+        reader.preamble()
+
+        if reader.colormap:
+            # Indexed colour: map palette indices through a 256-entry alpha table
+            # instead of expanding the palette to RGB(A) with asDirect()
+            width, height, rows, _info = reader.read()
+            if not reader.trns:
+                return width, height, 8, None
+            table = (bytes(reader.trns) + b"\xff" * 256)[:256]
+            return width, height, 8, b"".join(bytes(row).translate(table) for row in rows)
+
+        width, height, rows, info = reader.asDirect()
+        planes = info["planes"]
+
+        if not info["alpha"]:
+            return width, height, 8, None
+
+        # Alpha is the last plane value of every pixel
+        if info["bitdepth"] > 8:
+            plane = array("H")
+            for row in rows:
+                plane.extend(row[planes - 1::planes])
+            return width, height, 16, plane.tobytes()
+        plane = bytearray()
+        for row in rows:
+            plane += row[planes - 1::planes]
+        return width, height, 8, plane
 
-def _load_alpha_mask_png(
-    path: str, threshold: int
-) -> tuple[list[tuple[int, int]], int, int]:
-    """Load a PNG image via bundled png.py and return non-transparent pixel coordinates."""
-    width, height, rows, info = _load_png_reader(path)
-    planes = info["planes"]
-    has_alpha = info["alpha"]
-
-    coords: list[tuple[int, int]] = []
-    for y, row in enumerate(rows):
-        for x in range(width):
-            if has_alpha:
-                # Alpha is the last plane value for this pixel
-                alpha = row[x * planes + (planes - 1)]
-                if alpha >= threshold:
-                    coords.append((x, y))
-            else:
-                # No alpha channel — all pixels are opaque
-                coords.append((x, y))
-
-    return coords, width, height
-
-
-def _load_binary_mask_png(
-    path: str, threshold: int
-) -> tuple[list[list[bool]], int, int]:
-    """Load a PNG image via bundled png.py and return a 2D boolean mask."""
-    width, height, rows, info = _load_png_reader(path)
-    planes = info["planes"]
-    has_alpha = info["alpha"]
 
-    mask: list[list[bool]] = []
-    for row in rows:
-        mask_row: list[bool] = []
-        for x in range(width):
-            if has_alpha:
-                alpha = row[x * planes + (planes - 1)]
-                mask_row.append(alpha >= threshold)
-            else:
-                mask_row.append(True)
-        mask.append(mask_row)
+# ---------------------------------------------------------------------------
+# Alpha plane cache
+# ---------------------------------------------------------------------------
 
-    return mask, width, height
+_CACHE_MAGIC = b"DAP1"
+# magic, width, height, bitdepth (0 = no alpha)
+_CACHE_HEADER = struct.Struct(">4sIIB")
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _cache_dir() -> str:
+    """Cache directory: $DEFOLD_MASK_CACHE_DIR or <XDG cache home>/defold-image-loader."""
+    override = os.environ.get("DEFOLD_MASK_CACHE_DIR", "").strip()
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME", "").strip() or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "defold-image-loader")
+
+
+def _cache_max_bytes() -> int:
+    """Size cap of the cache directory: $DEFOLD_MASK_CACHE_MAX_MB or 256 MB."""
+    value = os.environ.get("DEFOLD_MASK_CACHE_MAX_MB", "").strip()
+    try:
+        return int(float(value) * 1024 * 1024) if value else DEFAULT_CACHE_MAX_BYTES
+    except ValueError:
+        return DEFAULT_CACHE_MAX_BYTES
+
+
+def _resolve_cache_flag(cache: bool | None) -> bool:
+    """Resolve the cache flag from argument and environment variable (DEFOLD_MASK_CACHE=0 disables)."""
+    if cache is not None:
+        return cache
+    return os.environ.get("DEFOLD_MASK_CACHE", "").strip().lower() not in ("0", "false", "no")
+
+
+def _cache_path(path: str, backend: str) -> str:
+    """Cache entry path for the file's content hash and the decoding backend."""
+    # Chunked update rather than hashlib.file_digest, which needs Python 3.11
+    digest = hashlib.sha1()
+    with open_image(path) as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return os.path.join(_cache_dir(), f"{digest.hexdigest()}-{backend}.alpha")
+
+
+def _cache_read(entry_path: str) -> tuple[int, int, int, bytes | None] | None:
+    """Read a cache entry; returns (width, height, bitdepth, alpha plane) or None on a miss."""
+    try:
+        with open(entry_path, "rb") as f:
+            blob = f.read()
+        magic, width, height, bitdepth = _CACHE_HEADER.unpack_from(blob)
+        if magic != _CACHE_MAGIC:
+            return None
+        if bitdepth == 0:
+            return width, height, 8, None
+        plane = zlib.decompress(blob[_CACHE_HEADER.size:])
+        if len(plane) != width * height * bitdepth // 8:
+            return None
+        # Bump mtime so eviction drops least recently used entries first
+        os.utime(entry_path)
+        return width, height, bitdepth, plane
+    except (OSError, struct.error, zlib.error):
+        return None
+
+
+def _cache_write(entry_path: str, width: int, height: int, bitdepth: int, plane: bytes | None) -> None:
+    """Write a cache entry atomically, then evict old entries over the size cap.
+
+    Failures are ignored: the cache is an optimization only.
+    """
+    header = _CACHE_HEADER.pack(_CACHE_MAGIC, width, height, 0 if plane is None else bitdepth)
+    payload = b"" if plane is None else zlib.compress(plane, 1)
+    cache_dir = os.path.dirname(entry_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Unique per writer: threads of one process may store the same entry
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp_path, entry_path)
+        _cache_evict(cache_dir, _cache_max_bytes())
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _cache_evict(cache_dir: str, max_bytes: int) -> None:
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".alpha") and entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+    entries.sort()
+    for _mtime, size, entry_path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue
+        total -= size
 
 
 # ---------------------------------------------------------------------------
@@ -181,19 +669,17 @@ def _resolve_force_flag(force_png_py: bool | None) -> bool:
     return os.environ.get("FORCE_PNG_PY", "").strip() in ("1", "true", "yes")
 
 
-def load_alpha_mask(
-    path: str, threshold: int, *, force_png_py: bool | None = None
-) -> tuple[list[tuple[int, int]], int, int]:
-    """Load image and return list of non-transparent pixel coordinates, width, height.
+_png_fallback_reported = False
 
-    Tries PIL first, falls back to bundled png.py for PNG files.
-    Set force_png_py=True or env FORCE_PNG_PY=1 to skip PIL.
+
+def _use_pil(path: str, force_png_py: bool | None) -> bool:
+    """Pick the backend: True for PIL, False for the bundled png.py reader.
+
+    Raises ImportError for non-PNG files when PIL is unavailable.
     """
     force = _resolve_force_flag(force_png_py)
-    pil = _try_import_pil(force)
-
-    if pil is not None:
-        return _load_alpha_mask_pil(path, threshold)
+    if _try_import_pil(force) is not None:
+        return True
 
     # Fallback to png.py
     if not _is_png(path):
@@ -202,30 +688,261 @@ def load_alpha_mask(
             "Install it from your terminal:\n"
             "    pip install pillow"
         )
-    print("INFO: PIL not available, using bundled png.py reader.", file=sys.stderr)
-    return _load_alpha_mask_png(path, threshold)
+    global _png_fallback_reported
+    if not _png_fallback_reported:
+        print("INFO: PIL not available, using bundled png.py reader.", file=sys.stderr)
+        _png_fallback_reported = True
+    return False
+
+
+def load_alpha_plane(
+    path: str, *, force_png_py: bool | None = None, cache: bool | None = None
+) -> tuple[int, int, int, bytes | None]:
+    """Decode the alpha channel; return (width, height, bitdepth, alpha plane).
+
+    The plane is None for images without alpha.  Decoded planes are kept in a
+    compressed on-disk cache keyed by file content and backend, so masks at
+    any threshold can be rebuilt without decoding again.  Pass cache=False or
+    set DEFOLD_MASK_CACHE=0 to bypass it.
+    """
+    backend = "pil" if _use_pil(path, force_png_py) else "png"
+    entry_path = _cache_path(path, backend) if _resolve_cache_flag(cache) else None
+    if entry_path is not None:
+        cached = _cache_read(entry_path)
+        if cached is not None:
+            return cached
+
+    if backend == "pil":
+        width, height, plane = _load_alpha_pil(path)
+        bitdepth = 8
+    else:
+        width, height, bitdepth, plane = _load_alpha_png(path)
 
+    if entry_path is not None:
+        _cache_write(entry_path, width, height, bitdepth, plane)
+    return width, height, bitdepth, plane
+
+
+def _threshold_plane(plane: bytes, bitdepth: int, threshold: int) -> bytes:
+    """Threshold an alpha plane into one byte per pixel (1 = alpha >= threshold, 0 otherwise)."""
+    if bitdepth > 8:
+        # 16-bit alpha does not fit a translate() table; compare values directly
+        return bytes(a >= threshold for a in memoryview(plane).cast("H"))
+    return plane.translate(_threshold_table(threshold))
 
-def load_binary_mask(
-    path: str, threshold: int, *, force_png_py: bool | None = None
-) -> tuple[list[list[bool]], int, int]:
-    """Load image and return a 2D boolean mask (True = opaque), width, height.
+
+def parse_roi(text: str) -> tuple[int, int, int, int]:
+    """Parse an "X,Y,W,H" region of interest (argparse type).
+
+    Raises argparse.ArgumentTypeError, whose message argparse shows as is.
+    """
+    try:
+        x, y, w, h = (int(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ROI must be X,Y,W,H integers, got: {text!r}") from None
+    if x < 0 or y < 0 or w <= 0 or h <= 0:
+        raise argparse.ArgumentTypeError(f"ROI must have X,Y >= 0 and W,H > 0, got: {text!r}")
+    return x, y, w, h
+
+
+def parse_scale(text: str) -> float:
+    """Parse a --scale value in (0, 1] (argparse type)."""
+    try:
+        scale = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"scale must be a number, got: {text!r}") from None
+    if not 0.0 < scale <= 1.0:
+        raise argparse.ArgumentTypeError(f"scale must be in (0, 1], got: {text!r}")
+    return scale
+
+
+def _scale_factor(scale: float) -> int:
+    """Integer box factor for a scale in (0, 1]: 1 / scale rounded half up.
+
+    Half up rather than round()'s half-to-even, so ties always pick the
+    coarser mask: 0.4 (1 / scale = 2.5) gives 3 cells per side, not 2.
+    """
+    if not 0.0 < scale <= 1.0:
+        raise ValueError(f"scale must be in (0, 1], got {scale}")
+    return int(1.0 / scale + 0.5)
+
+
+def _make_frame(
+    width: int, height: int, scale: float, max_dim: int | None, roi: tuple[int, int, int, int] | None
+) -> Frame:
+    """Resolve ROI (clipped to the image) and the integer box factor for the requested resolution."""
+    x, y, w, h = roi if roi is not None else (0, 0, width, height)
+    w = min(w, width - x)
+    h = min(h, height - y)
+    if w <= 0 or h <= 0:
+        raise ValueError(f"ROI {roi} lies outside the {width}x{height} image")
+    factor = _scale_factor(scale)
+    if max_dim is not None:
+        if max_dim < 1:
+            raise ValueError(f"max_dim must be at least 1, got {max_dim}")
+        factor = max(factor, -(-max(w, h) // max_dim))
+    return Frame(factor, x, y, w, h, width, height)
+
+
+def _crop_plane(plane: bytes, width: int, bytes_per_pixel: int, frame: Frame) -> bytes:
+    """Cut the frame's region out of a row-major plane."""
+    if frame.width == width and frame.x == 0:
+        start = frame.y * width * bytes_per_pixel
+        return plane[start:start + frame.height * width * bytes_per_pixel]
+    row_bytes = width * bytes_per_pixel
+    x0 = frame.x * bytes_per_pixel
+    x1 = x0 + frame.width * bytes_per_pixel
+    return b"".join(
+        plane[y * row_bytes + x0:y * row_bytes + x1] for y in range(frame.y, frame.y + frame.height)
+    )
+
+
+def _box_or(data: bytes, width: int, height: int, factor: int) -> tuple[bytes, int, int]:
+    """Downsample a 0/1 mask by factor; a cell is opaque if any pixel of its box is.
+
+    Rows and columns are OR-ed as big integers, so the work stays in C.
+    """
+    out_w = -(-width // factor)
+    out_h = -(-height // factor)
+    pad = b"\x00" * (out_w * factor - width)
+    out = bytearray()
+    for oy in range(out_h):
+        acc = 0
+        for y in range(oy * factor, min((oy + 1) * factor, height)):
+            acc |= int.from_bytes(data[y * width:(y + 1) * width], "big")
+        row = acc.to_bytes(width, "big") + pad
+        acc = 0
+        for k in range(factor):
+            acc |= int.from_bytes(row[k::factor], "big")
+        out += acc.to_bytes(out_w, "big")
+    return bytes(out), out_w, out_h
+
+
+def _load_region(
+    path: str, threshold: int, force_png_py: bool | None, cache: bool | None,
+    scale: float, max_dim: int | None, roi: tuple[int, int, int, int] | None,
+) -> tuple[bytes | None, int, int, Frame]:
+    """Shared part of load_mask()/load_spans(): (0/1 data or None if full, width, height, frame)."""
+    size = _sniff_opaque_size(path)
+    if size is not None:
+        frame = _make_frame(*size, scale, max_dim, roi)
+        return None, -(-frame.width // frame.scale), -(-frame.height // frame.scale), frame
+
+    width, height, bitdepth, plane = load_alpha_plane(path, force_png_py=force_png_py, cache=cache)
+    frame = _make_frame(width, height, scale, max_dim, roi)
+    out_w = -(-frame.width // frame.scale)
+    out_h = -(-frame.height // frame.scale)
+    if plane is None:
+        return None, out_w, out_h, frame
+
+    if frame.width != width or frame.height != height:
+        plane = _crop_plane(plane, width, bitdepth // 8, frame)
+    data = _threshold_plane(plane, bitdepth, threshold)
+    if frame.scale > 1:
+        data, out_w, out_h = _box_or(data, frame.width, frame.height, frame.scale)
+    return data, out_w, out_h, frame
+
+
+def load_mask(
+    path: str, threshold: int, *, force_png_py: bool | None = None, cache: bool | None = None,
+    scale: float = 1.0, max_dim: int | None = None, roi: tuple[int, int, int, int] | None = None,
+) -> Mask:
+    """Load image and return a Mask of pixels with alpha >= threshold.
 
     Tries PIL first, falls back to bundled png.py for PNG files.
     Set force_png_py=True or env FORCE_PNG_PY=1 to skip PIL.
+    Images whose header shows no transparency return a full mask without
+    decoding any pixel data; other alpha planes go through the cache (see
+    load_alpha_plane()).
+
+    roi=(x, y, w, h) crops to a region of the image.  scale in (0, 1) or
+    max_dim (longest mask side in cells) reduces the mask by an integer box
+    factor (1 / scale rounded half up); a cell is opaque when any pixel of
+    its box is.  Other scale values raise ValueError.  mask.frame maps mask
+    coordinates back to source pixels.
+    """
+    data, width, height, frame = _load_region(path, threshold, force_png_py, cache, scale, max_dim, roi)
+    if data is None:
+        return Mask.full(width, height, frame)
+    return Mask(width, height, bytearray(data), frame)
+
+
+def load_spans(
+    path: str, threshold: int, *, force_png_py: bool | None = None, cache: bool | None = None,
+    scale: float = 1.0, max_dim: int | None = None, roi: tuple[int, int, int, int] | None = None,
+) -> Spans:
+    """Load image and return run-length encoded Spans of pixels with alpha >= threshold.
+
+    Runs are found row by row with bytes.find() on the thresholded alpha, so
+    no per-pixel Python objects are created.  Backend selection, caching,
+    the header-only shortcut for opaque images and roi/scale/max_dim as
+    load_mask().
+    """
+    data, width, height, frame = _load_region(path, threshold, force_png_py, cache, scale, max_dim, roi)
+    if data is None:
+        return Spans.full(width, height, frame)
+    rows = [_find_spans(data, y * width, (y + 1) * width) for y in range(height)]
+    return Spans(width, height, rows, frame)
+
+
+def _load_job(path: str, threshold: int, spans: bool, options: dict) -> Mask | Spans:
+    """Worker entry point of load_masks() (module level so process pools can pickle it)."""
+    return (load_spans if spans else load_mask)(path, threshold, **options)
+
+
+def load_masks(
+    paths, threshold: int, *, workers: int | None = None, spans: bool = False,
+    force_png_py: bool | None = None, cache: bool | None = None,
+    scale: float = 1.0, max_dim: int | None = None,
+):
+    """Load many images in parallel; yield (path, mask, error) as each one completes.
+
+    mask is a Mask (or Spans with spans=True) and error is None, or mask is
+    None and error is the exception raised for that path.  PIL releases the
+    GIL while decoding, so a thread pool is used; the pure-Python png.py
+    backend runs in a process pool instead.  At most 2 × workers images are
+    in flight, so memory stays bounded however many paths are given.
     """
+    workers = workers or os.cpu_count() or 1
     force = _resolve_force_flag(force_png_py)
-    pil = _try_import_pil(force)
+    options = {"force_png_py": force, "cache": cache, "scale": scale, "max_dim": max_dim}
+    use_processes = _try_import_pil(force) is None and workers > 1
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+    path_iter = iter(paths)
+    with executor_class(max_workers=workers) as pool:
+        pending: dict = {}
+        while True:
+            for path in path_iter:
+                pending[pool.submit(_load_job, path, threshold, spans, options)] = path
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                return
+            done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                error = future.exception()
+                yield path, (None if error else future.result()), error
 
-    if pil is not None:
-        return _load_binary_mask_pil(path, threshold)
 
-    # Fallback to png.py
-    if not _is_png(path):
-        raise ImportError(
-            "Pillow (PIL) is required for non-PNG images (JPEG, etc.).\n"
-            "Install it from your terminal:\n"
-            "    pip install pillow"
-        )
-    print("INFO: PIL not available, using bundled png.py reader.", file=sys.stderr)
-    return _load_binary_mask_png(path, threshold)
+def load_alpha_mask(
+    path: str, threshold: int, *, force_png_py: bool | None = None
+) -> tuple[list[tuple[int, int]], int, int]:
+    """Load image and return list of non-transparent pixel coordinates, width, height.
+
+    Adapter over load_mask() for callers that expect a coordinate list.
+    """
+    mask = load_mask(path, threshold, force_png_py=force_png_py)
+    return mask.to_coords(), mask.width, mask.height
+
+
+def load_binary_mask(
+    path: str, threshold: int, *, force_png_py: bool | None = None
+) -> tuple[list[list[bool]], int, int]:
+    """Load image and return a 2D boolean mask (True = opaque), width, height.
+
+    Adapter over load_mask() for callers that expect a list of boolean rows.
+    """
+    mask = load_mask(path, threshold, force_png_py=force_png_py)
+    return mask.to_rows(), mask.width, mask.height
@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: CC0-1.0
+
+"""Polyline and polygon simplification shared by the shape generators.
+
+Ramer-Douglas-Peucker keeps the vertex farthest from the chord of a range
+whenever it is more than epsilon away, then handles both halves.  Ranges are
+processed from an explicit stack over a flat coordinate array and the kept
+vertices are marked in a bytearray, so no sub-lists are copied and the
+contour length is not limited by the recursion limit.  With NumPy installed,
+long ranges use a vectorized distance kernel.
+
+Visvalingam-Whyatt repeatedly removes the vertex whose triangle with its two
+neighbours has the smallest area.  This implementation keeps the vertices in
+a doubly linked ring and their areas in a binary heap; after a removal only
+the two neighbours are re-scored, so simplifying n points costs O(n log n).
+
+Ties are broken by the lower original index, which is the order a linear
+"first minimum" scan over the remaining points would pick.
+"""
+
+import heapq
+import math
+from array import array
+from collections.abc import Iterator
+
+Point = tuple[float, float]
+
+# Ranges with at least this many interior points use the NumPy kernel
+NUMPY_MIN_RANGE = 64
+
+
+def _try_import_numpy():
+    """Try to import NumPy, return the module or None."""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def flat_coords(points: list[Point]) -> array:
+    """Points as a flat array('d') of x0, y0, x1, y1, ..."""
+    coords = array("d")
+    for x, y in points:
+        coords.append(x)
+        coords.append(y)
+    return coords
+
+
+def segment_distance(
+    px: float, py: float, ax: float, ay: float, dx: float, dy: float, length_sq: float
+) -> float:
+    """Distance from P to the segment from A along (dx, dy)."""
+    if length_sq == 0.0:
+        return math.hypot(px - ax, py - ay)
+    t = ((px - ax) * dx + (py - ay) * dy) / length_sq
+    t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def _farthest(coords: array, first: int, last: int, candidates=None) -> tuple[int, float]:
+    """Interior point of coords[first..last] farthest from segment first-last.
+
+    Only the given candidate indices are checked when passed.  Returns
+    (index, distance); the lowest index wins ties.
+    """
+    ax, ay = coords[2 * first], coords[2 * first + 1]
+    dx = coords[2 * last] - ax
+    dy = coords[2 * last + 1] - ay
+    length_sq = dx * dx + dy * dy
+    best = first
+    best_d = 0.0
+    for i in candidates if candidates is not None else range(first + 1, last):
+        d = segment_distance(coords[2 * i], coords[2 * i + 1], ax, ay, dx, dy, length_sq)
+        if d > best_d:
+            best_d = d
+            best = i
+    return best, best_d
+
+
+def _farthest_numpy(np, coords: array, xs, ys, first: int, last: int) -> tuple[int, float]:
+    """NumPy version of _farthest().
+
+    np.hypot may round differently from math.hypot, so the near-maximal
+    points are re-checked with _farthest() to pick the same point.
+    """
+    ax, ay = xs[first], ys[first]
+    dx = xs[last] - ax
+    dy = ys[last] - ay
+    length_sq = dx * dx + dy * dy
+    px = xs[first + 1:last]
+    py = ys[first + 1:last]
+    if length_sq == 0.0:
+        d = np.hypot(px - ax, py - ay)
+    else:
+        t = np.clip(((px - ax) * dx + (py - ay) * dy) / length_sq, 0.0, 1.0)
+        d = np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+    near = np.flatnonzero(d >= d.max() * (1.0 - 1e-9)) + (first + 1)
+    return _farthest(coords, first, last, near.tolist())
+
+
+def rdp_mark(coords: array, keep: bytearray, first: int, last: int, epsilon: float) -> None:
+    """Ramer-Douglas-Peucker on the polyline coords[first..last] (point indices).
+
+    Sets keep[i] = 1 for every kept point, including both end points.
+    """
+    keep[first] = keep[last] = 1
+    np = _try_import_numpy() if last - first > NUMPY_MIN_RANGE else None
+    if np is not None:
+        flat = np.frombuffer(coords, dtype=np.float64)
+        xs, ys = flat[0::2], flat[1::2]
+
+    stack = [(first, last)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        if np is not None and hi - lo > NUMPY_MIN_RANGE:
+            i, d = _farthest_numpy(np, coords, xs, ys, lo, hi)
+        else:
+            i, d = _farthest(coords, lo, hi)
+        if d > epsilon:
+            keep[i] = 1
+            stack.append((i, hi))
+            stack.append((lo, i))
+
+
+def ramer_douglas_peucker(points: list[Point], epsilon: float) -> list[int]:
+    """Indices of the points kept when simplifying an open polyline."""
+    n = len(points)
+    if n <= 2:
+        return list(range(n))
+    keep = bytearray(n)
+    rdp_mark(flat_coords(points), keep, 0, n - 1, epsilon)
+    return [i for i in range(n) if keep[i]]
+
+
+def triangle_area(a: Point, b: Point, c: Point) -> float:
+    """Area of triangle formed by three points."""
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])) / 2.0
+
+
+def vw_removal_order(points: list[Point], closed: bool = True) -> Iterator[tuple[int, float]]:
+    """Yield (index, area) of vertices in Visvalingam-Whyatt removal order.
+
+    For a closed polygon the last 3 vertices are never yielded; for an open
+    polyline the two end points are kept fixed and never yielded.  Stopping
+    the iteration early leaves the remaining vertices in a valid state, so
+    callers can simplify to any vertex count or area tolerance.
+    """
+    n = len(points)
+    keep = 3 if closed else 2
+    if n <= keep:
+        return
+
+    prev = [i - 1 for i in range(n)]
+    nxt = [i + 1 for i in range(n)]
+    if closed:
+        prev[0] = n - 1
+        nxt[n - 1] = 0
+    removed = bytearray(n)
+    # Current area of every vertex; heap entries with a stale area are skipped
+    areas = [0.0] * n
+
+    heap: list[tuple[float, int]] = []
+    for i in range(n):
+        if not closed and (i == 0 or i == n - 1):
+            continue
+        areas[i] = triangle_area(points[prev[i]], points[i], points[nxt[i]])
+        heap.append((areas[i], i))
+    heapq.heapify(heap)
+
+    remaining = n
+    while heap and remaining > keep:
+        area, i = heapq.heappop(heap)
+        if removed[i] or area != areas[i]:
+            continue
+        removed[i] = 1
+        remaining -= 1
+        yield i, area
+
+        p, q = prev[i], nxt[i]
+        nxt[p] = q
+        prev[q] = p
+        for j in (p, q):
+            if not closed and (j == 0 or j == n - 1):
+                continue
+            areas[j] = triangle_area(points[prev[j]], points[j], points[nxt[j]])
+            heapq.heappush(heap, (areas[j], j))
+
+
+def visvalingam_whyatt(
+    points: list[Point],
+    max_points: int | None = None,
+    min_area: float | None = None,
+    closed: bool = True,
+) -> list[Point]:
+    """Simplify a polygon (closed=True) or polyline with Visvalingam-Whyatt.
+
+    Removes vertices until at most max_points remain and/or every remaining
+    vertex spans a triangle of at least min_area.  Vertex order (and thus
+    winding) is preserved.
+    """
+    n = len(points)
+    keep = [True] * n
+    count = n
+    for i, area in vw_removal_order(points, closed):
+        if (max_points is None or count <= max_points) and (min_area is None or area >= min_area):
+            break
+        keep[i] = False
+        count -= 1
+    return [p for p, k in zip(points, keep) if k]
@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
-"""Download defoldsdk.zip and extract share/proto into skill assets."""
+"""Download defoldsdk.zip and extract share/proto and the API reference into skill assets.
 
+Outputs:
+	assets/proto/  — proto schemas from share/proto/
+	assets/api/    — compact per-namespace API index compiled from the SDK's
+	                 ref-doc JSON (share/ref-doc.zip), read by lookup_api.py
+"""
+
+import html
+import io
 import json
 import os
+import re
 import shutil
 import sys
 import tempfile
@@ -95,10 +104,112 @@ def extract_share_proto(zip_path: Path, output_dir: Path) -> None:
 	print(f"  Extracted {extracted} proto file(s)")
 
 
+def _clean_doc(text: str | None) -> str:
+	"""Strip HTML markup from a ref-doc string and collapse whitespace."""
+	if not text:
+		return ""
+	text = re.sub(r"<[^>]+>", "", text)
+	return " ".join(html.unescape(text).split())
+
+
+def _compact_values(values: list[dict] | None) -> list[dict]:
+	"""Compact ref-doc parameters / return values to name, types, doc (and optional)."""
+	out: list[dict] = []
+	for v in values or []:
+		item = {
+			"name": v.get("name", ""),
+			"types": v.get("types") or [],
+			"doc": _clean_doc(v.get("doc")),
+		}
+		if v.get("is_optional") or item["name"].startswith("["):
+			item["optional"] = True
+		out.append(item)
+	return out
+
+
+def compile_ref_doc(doc: dict) -> dict:
+	"""Compile one ref-doc JSON document into a compact namespace entry."""
+	info = doc.get("info") or {}
+	elements = []
+	for e in doc.get("elements") or []:
+		element = {
+			"type": e.get("type", ""),
+			"name": e.get("name", ""),
+			"brief": _clean_doc(e.get("brief")),
+		}
+		description = _clean_doc(e.get("description"))
+		if description and description != element["brief"]:
+			element["description"] = description
+		if e.get("parameters"):
+			element["params"] = _compact_values(e["parameters"])
+		if e.get("returnvalues"):
+			element["returns"] = _compact_values(e["returnvalues"])
+		elements.append(element)
+
+	return {
+		"namespace": info.get("namespace", ""),
+		"name": info.get("name", ""),
+		"language": info.get("language", ""),
+		"brief": _clean_doc(info.get("brief")),
+		"elements": elements,
+	}
+
+
+def _iter_ref_doc_json(zip_path: Path):
+	"""Yield (doc_name, parsed JSON) for every ref-doc file in defoldsdk.zip.
+
+	The docs ship either as a nested share/ref-doc.zip or as loose *_doc.json files.
+	"""
+	with zipfile.ZipFile(zip_path, "r") as zf:
+		for entry in zf.infolist():
+			if entry.filename.endswith("/"):
+				continue
+			if entry.filename.endswith("ref-doc.zip"):
+				with zipfile.ZipFile(io.BytesIO(zf.read(entry))) as docs:
+					for doc_entry in docs.infolist():
+						if doc_entry.filename.endswith(".json"):
+							yield Path(doc_entry.filename).stem, json.loads(docs.read(doc_entry))
+			elif entry.filename.startswith("defoldsdk/share/") and entry.filename.endswith("_doc.json"):
+				yield Path(entry.filename).stem, json.loads(zf.read(entry))
+
+
+def extract_ref_doc(zip_path: Path, output_dir: Path, version: str = "", sha1: str = "") -> None:
+	"""Compile the SDK ref-doc into output_dir/<doc>.json plus an index.json."""
+	if output_dir.exists():
+		print(f"  Removing existing {output_dir}...")
+		shutil.rmtree(output_dir)
+
+	output_dir.mkdir(parents=True, exist_ok=True)
+
+	namespaces: dict[str, list[str]] = {}
+	docs = 0
+	elements = 0
+	for doc_name, doc in _iter_ref_doc_json(zip_path):
+		if not re.match(r"^[A-Za-z0-9_.-]+$", doc_name):
+			raise RuntimeError(f"Unsafe ref-doc file name: {doc_name}")
+		compact = compile_ref_doc(doc)
+		doc_id = doc_name[:-len("_doc")] if doc_name.endswith("_doc") else doc_name
+		(output_dir / f"{doc_id}.json").write_text(
+			json.dumps(compact, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+		)
+		namespaces.setdefault(compact["namespace"] or doc_id, []).append(doc_id)
+		docs += 1
+		elements += len(compact["elements"])
+
+	if docs == 0:
+		print("  WARNING: No ref-doc found in the SDK zip, API index not generated")
+		return
+
+	index = {"version": version, "sha1": sha1, "namespaces": namespaces}
+	(output_dir / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+	print(f"  Compiled {docs} ref-doc file(s), {elements} element(s)")
+
+
 def main() -> None:
 	script_dir = Path(__file__).parent
 	project_root = find_project_root(script_dir)
 	proto_dir = Path(__file__).resolve().parent.parent / "assets" / "proto"
+	api_dir = Path(__file__).resolve().parent.parent / "assets" / "api"
 
 	print("Fetching Defold stable release info...")
 	request = urllib.request.Request(
@@ -122,6 +233,9 @@ def main() -> None:
 
 		print(f"  Extracting share/proto/ -> {proto_dir.relative_to(project_root)}")
 		extract_share_proto(zip_path, proto_dir)
+
+		print(f"  Compiling API reference -> {api_dir.relative_to(project_root)}")
+		extract_ref_doc(zip_path, api_dir, version, sha1)
 	finally:
 		shutil.rmtree(tmp_dir, ignore_errors=True)
 
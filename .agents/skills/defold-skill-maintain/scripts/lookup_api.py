@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Look up the offline Defold API reference compiled by fetch_proto.py.
+
+Usage:
+	python .agents/skills/defold-skill-maintain/scripts/lookup_api.py go.animate      # one element
+	python .agents/skills/defold-skill-maintain/scripts/lookup_api.py go              # list a namespace
+	python .agents/skills/defold-skill-maintain/scripts/lookup_api.py --search tween  # name/brief search
+
+Input:
+	.agents/skills/defold-skill-maintain/assets/api/ (index.json + one JSON per ref-doc file)
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent / "assets" / "api"
+
+
+def load_index(api_dir: Path = API_DIR) -> dict:
+	"""Load index.json of the compiled API reference."""
+	return json.loads((api_dir / "index.json").read_text(encoding="utf-8"))
+
+
+def load_doc(doc_id: str, api_dir: Path = API_DIR) -> dict:
+	"""Load one compiled ref-doc file."""
+	return json.loads((api_dir / f"{doc_id}.json").read_text(encoding="utf-8"))
+
+
+def iter_docs(index: dict, api_dir: Path = API_DIR):
+	"""Yield every compiled ref-doc of the index."""
+	for doc_ids in index["namespaces"].values():
+		for doc_id in doc_ids:
+			yield load_doc(doc_id, api_dir)
+
+
+def find_elements(name: str, index: dict, api_dir: Path = API_DIR) -> list[dict]:
+	"""Find elements by exact (case-insensitive) name, looking in the likely namespace first."""
+	lowered = name.lower()
+	namespace = name.rsplit(".", 1)[0] if "." in name else ""
+	doc_ids = index["namespaces"].get(namespace, [])
+	docs = [load_doc(d, api_dir) for d in doc_ids] or list(iter_docs(index, api_dir))
+	found = [e for doc in docs for e in doc["elements"] if e["name"].lower() == lowered]
+	if not found and doc_ids:
+		found = [e for doc in iter_docs(index, api_dir) for e in doc["elements"] if e["name"].lower() == lowered]
+	return found
+
+
+def format_signature(element: dict) -> str:
+	"""Render `name(param, [optional])` for functions, the bare name otherwise."""
+	if element["type"] != "FUNCTION":
+		return element["name"]
+	params = []
+	for p in element.get("params", []):
+		name = p["name"]
+		params.append(f"[{name.strip('[]')}]" if p.get("optional") else name)
+	return f"{element['name']}({', '.join(params)})"
+
+
+def format_element(element: dict) -> str:
+	"""Render an element with its parameters and return values."""
+	lines = [f"{format_signature(element)}  ({element['type'].lower()})"]
+	if element.get("brief"):
+		lines.append(f"  {element['brief']}")
+	if element.get("description"):
+		lines.append(f"  {element['description']}")
+	for title, key in (("Parameters", "params"), ("Returns", "returns")):
+		if element.get(key):
+			lines.append(f"  {title}:")
+			for v in element[key]:
+				types = " | ".join(v["types"])
+				lines.append(f"    {v['name']}" + (f" ({types})" if types else "") + (f" — {v['doc']}" if v["doc"] else ""))
+	return "\n".join(lines)
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description="Look up the offline Defold API reference.")
+	parser.add_argument("name", nargs="?", help="Element name (e.g. go.animate) or namespace (e.g. go)")
+	parser.add_argument("--search", "-s", help="Case-insensitive substring search over names and briefs")
+	args = parser.parse_args()
+
+	if not (API_DIR / "index.json").exists():
+		print(
+			"ERROR: API index not found. Run fetch_proto.py first:\n"
+			"    python .agents/skills/defold-skill-maintain/scripts/fetch_proto.py",
+			file=sys.stderr,
+		)
+		return 1
+
+	index = load_index()
+
+	if args.search:
+		needle = args.search.lower()
+		for doc in iter_docs(index):
+			for e in doc["elements"]:
+				if needle in e["name"].lower() or needle in e.get("brief", "").lower():
+					print(f"{format_signature(e)}\t{e.get('brief', '')}")
+		return 0
+
+	if not args.name:
+		print(f"Defold {index.get('version', '')} API namespaces:")
+		for namespace in sorted(index["namespaces"]):
+			print(f"  {namespace}")
+		return 0
+
+	if args.name in index["namespaces"]:
+		for doc_id in index["namespaces"][args.name]:
+			doc = load_doc(doc_id)
+			print(f"# {doc['name'] or args.name} ({doc['language']}) — {doc['brief']}")
+			for e in doc["elements"]:
+				print(f"{format_signature(e)}\t{e.get('brief', '')}")
+		return 0
+
+	elements = find_elements(args.name, index)
+	if not elements:
+		print(f"ERROR: No API element named: {args.name}", file=sys.stderr)
+		return 1
+	print("\n\n".join(format_element(e) for e in elements))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
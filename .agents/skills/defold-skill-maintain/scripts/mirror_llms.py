@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Mirror the Defold llms Markdown pages listed in the fetch skills and search them offline.
+
+Usage:
+	python .agents/skills/defold-skill-maintain/scripts/mirror_llms.py sync [--skill NAME] [--workers N]
+	python .agents/skills/defold-skill-maintain/scripts/mirror_llms.py search <query> [--limit N]
+	python .agents/skills/defold-skill-maintain/scripts/mirror_llms.py show <url | title>
+
+The URL tables are parsed from the SKILL.md files of defold-api-fetch,
+defold-examples-fetch and defold-docs-fetch.  Pages are downloaded in
+parallel and revalidated with ETag / Last-Modified.  The store lives in
+.agents/skills/defold-skill-maintain/assets/llms/:
+
+	index.json    — store version, revision counter and per-URL metadata
+	objects/      — page contents, named by SHA-256 (content-addressed)
+	llms.sqlite   — SQLite FTS5 full-text index over all mirrored pages
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+STORE_VERSION = 1
+SKILLS_DIR = Path(__file__).resolve().parent.parent.parent
+STORE_DIR = Path(__file__).resolve().parent.parent / "assets" / "llms"
+DEFAULT_SKILLS = ["defold-api-fetch", "defold-examples-fetch", "defold-docs-fetch"]
+URL_PREFIX = "https://defold.com/"
+
+_SECTION_RE = re.compile(r"^##\s+(.+?)\s*$")
+_ROW_RE = re.compile(r"^\|\s*(.+?)\s*\|\s*(https://defold\.com/llms/\S+?\.md)\s*\|\s*$")
+
+
+def parse_skill_links(skill_md: Path) -> list[dict]:
+	"""Parse `| Title | URL |` table rows from a fetch skill's SKILL.md."""
+	links: list[dict] = []
+	section = ""
+	for line in skill_md.read_text(encoding="utf-8").splitlines():
+		match = _SECTION_RE.match(line)
+		if match:
+			section = match.group(1)
+			continue
+		match = _ROW_RE.match(line)
+		if match:
+			links.append({
+				"skill": skill_md.parent.name,
+				"section": section,
+				"title": match.group(1),
+				"url": match.group(2),
+			})
+	return links
+
+
+def load_index(store_dir: Path) -> dict:
+	"""Load index.json, or return an empty index for a new (or incompatible) store."""
+	index_path = store_dir / "index.json"
+	if index_path.exists():
+		index = json.loads(index_path.read_text(encoding="utf-8"))
+		if index.get("version") == STORE_VERSION:
+			return index
+	return {"version": STORE_VERSION, "revision": 0, "entries": {}}
+
+
+def save_index(store_dir: Path, index: dict) -> None:
+	"""Write index.json atomically."""
+	index_path = store_dir / "index.json"
+	tmp_path = index_path.with_suffix(".json.tmp")
+	tmp_path.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+	os.replace(tmp_path, index_path)
+
+
+def fetch_page(link: dict, entry: dict | None, base_url: str, store_dir: Path, force: bool) -> dict:
+	"""Fetch one page with conditional headers; return its updated index entry.
+
+	The returned entry has a `status` of "fetched", "not-modified" or "error".
+	"""
+	url = link["url"]
+	fetch_url = base_url + url[len(URL_PREFIX):] if base_url else url
+	headers = {"User-Agent": "mirror-llms-py"}
+	if entry and not force:
+		if entry.get("etag"):
+			headers["If-None-Match"] = entry["etag"]
+		if entry.get("last_modified"):
+			headers["If-Modified-Since"] = entry["last_modified"]
+
+	new_entry = dict(entry or {})
+	new_entry.update(skill=link["skill"], section=link["section"], title=link["title"])
+	try:
+		request = urllib.request.Request(fetch_url, headers=headers)
+		with urllib.request.urlopen(request, timeout=60) as response:
+			data = response.read()
+			etag = response.headers.get("ETag") or ""
+			last_modified = response.headers.get("Last-Modified") or ""
+	except urllib.error.HTTPError as e:
+		new_entry["status"] = "not-modified" if e.code == 304 and entry else "error"
+		new_entry["error"] = "" if new_entry["status"] == "not-modified" else f"HTTP {e.code}"
+		return new_entry
+	except (urllib.error.URLError, OSError) as e:
+		new_entry.update(status="error", error=str(e))
+		return new_entry
+
+	sha = hashlib.sha256(data).hexdigest()
+	object_path = store_dir / "objects" / f"{sha}.md"
+	if not object_path.exists():
+		# Unique per writer: pages with the same content share one object
+		fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=object_path.parent)
+		try:
+			with os.fdopen(fd, "wb") as f:
+				f.write(data)
+			os.replace(tmp_name, object_path)
+		except BaseException:
+			os.unlink(tmp_name)
+			raise
+
+	new_entry.update(
+		status="fetched" if not entry or entry.get("sha256") != sha else "not-modified",
+		error="",
+		sha256=sha,
+		etag=etag,
+		last_modified=last_modified,
+		fetched_at=int(time.time()),
+	)
+	return new_entry
+
+
+def build_fts(store_dir: Path, index: dict) -> int:
+	"""Rebuild the FTS5 index over all mirrored pages; returns the page count."""
+	db_path = store_dir / "llms.sqlite"
+	tmp_path = store_dir / "llms.sqlite.tmp"
+	if tmp_path.exists():
+		tmp_path.unlink()
+
+	conn = sqlite3.connect(tmp_path)
+	count = 0
+	try:
+		conn.execute(
+			"CREATE VIRTUAL TABLE pages USING fts5("
+			"title, section, body, url UNINDEXED, skill UNINDEXED, path UNINDEXED, "
+			"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+		)
+		for url, entry in index["entries"].items():
+			if not entry.get("sha256"):
+				continue
+			object_path = store_dir / "objects" / f"{entry['sha256']}.md"
+			body = object_path.read_text(encoding="utf-8", errors="replace")
+			conn.execute(
+				"INSERT INTO pages (title, section, body, url, skill, path) VALUES (?, ?, ?, ?, ?, ?)",
+				(entry["title"], entry["section"], body, url, entry["skill"], str(object_path)),
+			)
+			count += 1
+		conn.execute("INSERT INTO pages (pages) VALUES ('optimize')")
+		conn.commit()
+	finally:
+		conn.close()
+
+	os.replace(tmp_path, db_path)
+	return count
+
+
+def prune_objects(store_dir: Path, index: dict) -> int:
+	"""Delete page objects no longer referenced by the index."""
+	referenced = {e.get("sha256") for e in index["entries"].values()}
+	removed = 0
+	for object_path in (store_dir / "objects").glob("*.md"):
+		if object_path.stem not in referenced:
+			object_path.unlink()
+			removed += 1
+	return removed
+
+
+def sync(skills: list[str], *, workers: int = 16, base_url: str = "", force: bool = False,
+		store_dir: Path = STORE_DIR, skills_dir: Path = SKILLS_DIR) -> dict:
+	"""Mirror all pages listed in the given skills; returns the updated index."""
+	links: list[dict] = []
+	for skill in skills:
+		links.extend(parse_skill_links(skills_dir / skill / "SKILL.md"))
+	links = list({link["url"]: link for link in links}.values())
+
+	(store_dir / "objects").mkdir(parents=True, exist_ok=True)
+	index = load_index(store_dir)
+	old_entries = index["entries"]
+
+	print(f"Syncing {len(links)} page(s) with {workers} worker(s)...")
+	start = time.perf_counter()
+	with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+		results = list(pool.map(
+			lambda link: fetch_page(link, old_entries.get(link["url"]), base_url, store_dir, force),
+			links,
+		))
+	elapsed = time.perf_counter() - start
+
+	entries: dict[str, dict] = {}
+	# Keep pages from skills that were not part of this sync
+	for url, entry in old_entries.items():
+		if entry.get("skill") not in skills:
+			entries[url] = entry
+	fetched = not_modified = errors = 0
+	for link, entry in zip(links, results):
+		status = entry.pop("status")
+		error = entry.pop("error", "")
+		if status == "error":
+			errors += 1
+			print(f"  ERROR: {link['url']}: {error}", file=sys.stderr)
+			if not entry.get("sha256"):
+				continue
+		elif status == "fetched":
+			fetched += 1
+		else:
+			not_modified += 1
+		entries[link["url"]] = entry
+
+	changed = fetched > 0 or set(entries) != set(old_entries)
+	if changed:
+		index["revision"] += 1
+		for url, entry in entries.items():
+			if url not in old_entries or old_entries[url].get("sha256") != entry.get("sha256"):
+				entry["revision"] = index["revision"]
+	index["entries"] = entries
+	save_index(store_dir, index)
+
+	removed = prune_objects(store_dir, index)
+	pages = build_fts(store_dir, index)
+
+	print(
+		f"  {fetched} updated, {not_modified} unchanged, {errors} error(s), "
+		f"{removed} stale object(s) removed in {elapsed:.2f}s"
+	)
+	print(f"  Store revision {index['revision']}, {pages} page(s) indexed.")
+	return index
+
+
+def _match_query(query: str) -> str:
+	"""Turn free text into an FTS5 query: every word prefix-matched, all words OR-ed."""
+	words = re.findall(r"\w+", query.lower())
+	return " OR ".join(f'"{w}"*' for w in words)
+
+
+def search(query: str, limit: int = 10, store_dir: Path = STORE_DIR) -> list[dict]:
+	"""Full-text search over the mirror; returns best matches first."""
+	match = _match_query(query)
+	if not match:
+		return []
+	conn = sqlite3.connect(store_dir / "llms.sqlite")
+	try:
+		rows = conn.execute(
+			"SELECT title, section, url, skill, path, "
+			"snippet(pages, 2, '[', ']', '…', 12), bm25(pages, 10.0, 3.0, 1.0) AS rank "
+			"FROM pages WHERE pages MATCH ? ORDER BY rank LIMIT ?",
+			(match, limit),
+		).fetchall()
+	finally:
+		conn.close()
+	keys = ["title", "section", "url", "skill", "path", "snippet"]
+	return [dict(zip(keys, row[:-1])) for row in rows]
+
+
+def find_page(key: str, store_dir: Path = STORE_DIR) -> Path | None:
+	"""Find a mirrored page by exact URL, or by title / namespace (case-insensitive)."""
+	entries = load_index(store_dir)["entries"]
+	entry = entries.get(key)
+	if entry is None:
+		lowered = key.lower()
+		for candidate in entries.values():
+			title = candidate["title"].lower()
+			if title == lowered or title.split(" (")[0] == lowered:
+				entry = candidate
+				break
+	if entry is None or not entry.get("sha256"):
+		return None
+	return store_dir / "objects" / f"{entry['sha256']}.md"
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description="Offline mirror of the Defold llms Markdown pages.")
+	sub = parser.add_subparsers(dest="command", required=True)
+
+	p_sync = sub.add_parser("sync", help="Download / revalidate all pages and rebuild the index")
+	p_sync.add_argument("--skill", action="append", choices=DEFAULT_SKILLS,
+						help="Skill whose links to mirror (repeatable, default: all)")
+	p_sync.add_argument("--workers", "-w", type=int, default=16, help="Parallel downloads (default: 16)")
+	p_sync.add_argument("--force", action="store_true", help="Ignore ETags and download everything")
+	p_sync.add_argument("--base-url", default="",
+						help=f"Replace the {URL_PREFIX} prefix (e.g. a local HTTP server for testing)")
+
+	p_search = sub.add_parser("search", help="Full-text search over mirrored pages")
+	p_search.add_argument("query", nargs="+")
+	p_search.add_argument("--limit", "-k", type=int, default=10, help="Number of results (default: 10)")
+
+	p_show = sub.add_parser("show", help="Print a mirrored page by URL or title")
+	p_show.add_argument("key", help="Page URL, title or namespace (e.g. go)")
+
+	args = parser.parse_args()
+
+	if args.command == "sync":
+		sync(args.skill or DEFAULT_SKILLS, workers=args.workers, base_url=args.base_url, force=args.force)
+		return 0
+
+	if not (STORE_DIR / "llms.sqlite").exists():
+		print("ERROR: Mirror is empty. Run `mirror_llms.py sync` first.", file=sys.stderr)
+		return 1
+
+	if args.command == "search":
+		for r in search(" ".join(args.query), args.limit):
+			print(f"{r['title']}\t{r['url']}\t{r['path']}")
+			print("\t" + " ".join(r["snippet"].split()))
+		return 0
+
+	path = find_page(args.key)
+	if path is None:
+		print(f"ERROR: No mirrored page for: {args.key}", file=sys.stderr)
+		return 1
+	sys.stdout.write(path.read_text(encoding="utf-8"))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
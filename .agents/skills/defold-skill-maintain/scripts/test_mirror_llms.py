@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Tests for mirror_llms.py against a local HTTP stand-in for defold.com.
+
+Usage:
+	python -m unittest discover -s .agents/skills/defold-skill-maintain/scripts -p "test_*.py"
+"""
+
+import contextlib
+import hashlib
+import http.server
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import mirror_llms
+
+SKILL_MD = """# Test skill
+
+## API
+
+| Namespace | URL |
+|-----------|-----|
+| go (Game object) | https://defold.com/llms/apis/go.md |
+| vmath | https://defold.com/llms/apis/vmath.md |
+
+## Examples
+
+| Example | URL |
+|---------|-----|
+| Movement | https://defold.com/llms/examples/movement.md |
+| Movement copy | https://defold.com/llms/examples/movement-copy.md |
+"""
+
+
+class StandInServer(http.server.ThreadingHTTPServer):
+	"""Serves `pages` ({path: bytes}) with an ETag per content and records every request."""
+
+	def __init__(self):
+		super().__init__(("127.0.0.1", 0), StandInHandler)
+		self.pages: dict[str, bytes] = {}
+		self.requests: list[tuple[str, int]] = []
+		self.lock = threading.Lock()
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+	def do_GET(self):
+		body = self.server.pages.get(self.path)
+		if body is None:
+			status = 404
+		else:
+			etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+			status = 304 if self.headers.get("If-None-Match") == etag else 200
+		with self.server.lock:
+			self.server.requests.append((self.path, status))
+		self.send_response(status)
+		if status == 200:
+			self.send_header("ETag", etag)
+			self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		if status == 200:
+			self.wfile.write(body)
+
+	def log_message(self, format, *args):
+		pass
+
+
+class MirrorTest(unittest.TestCase):
+	def setUp(self):
+		self.server = StandInServer()
+		self.server.pages = {
+			"/llms/apis/go.md": b"# go\n\ngo.animate tweens a game object property.\n",
+			"/llms/apis/vmath.md": b"# vmath\n\nvmath.lerp interpolates vectors.\n",
+			"/llms/examples/movement.md": b"# Movement\n\nMove a sprite with the arrow keys.\n",
+			"/llms/examples/movement-copy.md": b"# Movement\n\nMove a sprite with the arrow keys.\n",
+		}
+		thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+		thread.start()
+		self.addCleanup(thread.join)
+		self.addCleanup(self.server.server_close)
+		self.addCleanup(self.server.shutdown)
+
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		self.skills_dir = Path(tmp.name) / "skills"
+		(self.skills_dir / "test-fetch").mkdir(parents=True)
+		(self.skills_dir / "test-fetch" / "SKILL.md").write_text(SKILL_MD, encoding="utf-8")
+		self.store_dir = Path(tmp.name) / "store"
+		self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+	def sync(self, **kwargs) -> dict:
+		with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+			return mirror_llms.sync(["test-fetch"], base_url=self.base_url, store_dir=self.store_dir,
+									skills_dir=self.skills_dir, **kwargs)
+
+	def statuses(self) -> list[int]:
+		statuses = [status for _path, status in self.server.requests]
+		self.server.requests.clear()
+		return statuses
+
+	def test_parse_skill_links(self):
+		links = mirror_llms.parse_skill_links(self.skills_dir / "test-fetch" / "SKILL.md")
+		self.assertEqual([link["title"] for link in links],
+						 ["go (Game object)", "vmath", "Movement", "Movement copy"])
+		self.assertEqual(links[0]["section"], "API")
+		self.assertEqual(links[2]["section"], "Examples")
+
+	def test_sync_search_and_show(self):
+		index = self.sync()
+		self.assertEqual(index["revision"], 1)
+		self.assertEqual(len(index["entries"]), 4)
+		self.assertEqual(sorted(self.statuses()), [200] * 4)
+
+		results = mirror_llms.search("lerp", store_dir=self.store_dir)
+		self.assertEqual([r["url"] for r in results], ["https://defold.com/llms/apis/vmath.md"])
+		path = mirror_llms.find_page("go", store_dir=self.store_dir)
+		self.assertIn(b"go.animate", path.read_bytes())
+
+	def test_same_content_shares_one_object(self):
+		# Both movement pages are fetched in parallel into the same object file
+		index = self.sync(workers=8)
+		entries = index["entries"]
+		self.assertEqual(entries["https://defold.com/llms/examples/movement.md"]["sha256"],
+						 entries["https://defold.com/llms/examples/movement-copy.md"]["sha256"])
+		objects = sorted(p.name for p in (self.store_dir / "objects").iterdir())
+		self.assertEqual(len(objects), 3)
+		self.assertTrue(all(name.endswith(".md") for name in objects))
+		for entry in entries.values():
+			data = (self.store_dir / "objects" / f"{entry['sha256']}.md").read_bytes()
+			self.assertEqual(hashlib.sha256(data).hexdigest(), entry["sha256"])
+
+	def test_revalidation_uses_etags(self):
+		self.sync()
+		self.statuses()
+		index = self.sync()
+		self.assertEqual(self.statuses(), [304] * 4)
+		self.assertEqual(index["revision"], 1)
+
+		index = self.sync(force=True)
+		self.assertEqual(self.statuses(), [200] * 4)
+		self.assertEqual(index["revision"], 1)
+
+	def test_changed_page_bumps_revision_and_prunes(self):
+		old = self.sync()["entries"]["https://defold.com/llms/apis/vmath.md"]["sha256"]
+		self.server.pages["/llms/apis/vmath.md"] = b"# vmath\n\nvmath.slerp added.\n"
+		index = self.sync()
+		entry = index["entries"]["https://defold.com/llms/apis/vmath.md"]
+		self.assertEqual(index["revision"], 2)
+		self.assertEqual(entry["revision"], 2)
+		self.assertEqual(index["entries"]["https://defold.com/llms/apis/go.md"]["revision"], 1)
+		self.assertFalse((self.store_dir / "objects" / f"{old}.md").exists())
+		self.assertEqual(len(mirror_llms.search("slerp", store_dir=self.store_dir)), 1)
+
+	def test_failed_page_keeps_previous_copy(self):
+		self.sync()
+		del self.server.pages["/llms/apis/go.md"]
+		index = self.sync(force=True)
+		self.assertIn("https://defold.com/llms/apis/go.md", index["entries"])
+		self.assertIsNotNone(mirror_llms.find_page("go", store_dir=self.store_dir))
+
+	def test_failed_new_page_is_skipped(self):
+		del self.server.pages["/llms/apis/go.md"]
+		index = self.sync()
+		self.assertNotIn("https://defold.com/llms/apis/go.md", index["entries"])
+		self.assertEqual(len(index["entries"]), 3)
+
+
+if __name__ == "__main__":
+	unittest.main()